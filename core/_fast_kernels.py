@@ -0,0 +1,258 @@
+"""
+Fused Numeric Kernels
+=====================
+
+Single-pass kernels for the hot loops of the episodic analysis, the
+stochastic redemption Monte Carlo and the two-asset expectations. They are
+compiled with Numba when it is installed; otherwise the equivalent NumPy
+implementations below are used, so Numba remains an optional dependency.
+"""
+
+from __future__ import annotations
+from typing import Tuple
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:  # Numba is optional
+    HAS_NUMBA = False
+    prange = range
+
+
+def _aggregate_loop(
+    redemptions: NDArray[np.float64],
+    counts: NDArray[np.int64],
+    durations: NDArray[np.float64],
+    eth_weight: float,
+    staking_pct: float,
+    v_sigma_v: float,
+    yield_per_day: float,
+) -> Tuple[float, float]:
+    """Fused loop over redemption patterns (compiled by Numba)"""
+    free_eth = eth_weight * (1.0 - staking_pct)
+    var_days = 0.0
+    benefits = 0.0
+
+    for k in range(redemptions.shape[0]):
+        delta = redemptions[k] * eth_weight - free_eth
+        if delta > 0.0:
+            episode_days = counts[k] * durations[k]
+            var_days += v_sigma_v * delta * delta * episode_days
+            benefits += delta * yield_per_day * episode_days
+
+    return var_days, benefits
+
+
+def _aggregate_numpy(
+    redemptions: NDArray[np.float64],
+    counts: NDArray[np.int64],
+    durations: NDArray[np.float64],
+    eth_weight: float,
+    staking_pct: float,
+    v_sigma_v: float,
+    yield_per_day: float,
+) -> Tuple[float, float]:
+    """NumPy fallback for aggregate_kernel"""
+    delta = np.maximum(0.0, redemptions * eth_weight - eth_weight * (1 - staking_pct))
+    episode_days = (counts * durations).astype(np.float64)  # float64 accumulation
+
+    var_days = v_sigma_v * float((delta * delta) @ episode_days)
+    benefits = yield_per_day * float(delta @ episode_days)
+    return var_days, benefits
+
+
+# aggregate_kernel(redemptions, counts, durations, eth_weight, staking_pct,
+#                  v_sigma_v, yield_per_day) -> (total_var_days, total_benefits)
+#
+# Totals over every episode of a redemption schedule, evaluated per pattern
+# (count-weighted) so no per-episode arrays are materialized.
+if HAS_NUMBA:
+    aggregate_kernel = njit(cache=True, fastmath=True)(_aggregate_loop)
+else:
+    aggregate_kernel = _aggregate_numpy
+
+
+def _sensitivity_loop(
+    deltas: NDArray[np.float64],
+    eth_weight: float,
+    staking_pct: float,
+    unit_weights: NDArray[np.float64],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Redemptions and active weights per delta_eth (compiled by Numba)"""
+    n_deltas = deltas.shape[0]
+    n_assets = unit_weights.shape[0]
+    free_eth = eth_weight * (1.0 - staking_pct)
+
+    redemptions = np.empty(n_deltas)
+    active = np.empty((n_deltas, n_assets))
+    for k in range(n_deltas):
+        delta = deltas[k]
+        redemptions[k] = (delta + free_eth) / eth_weight if delta > 0.0 else 0.0
+        for i in range(n_assets):
+            active[k, i] = delta * unit_weights[i]
+
+    return redemptions, active
+
+
+def _sensitivity_numpy(
+    deltas: NDArray[np.float64],
+    eth_weight: float,
+    staking_pct: float,
+    unit_weights: NDArray[np.float64],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """NumPy fallback for sensitivity_kernel"""
+    free_eth = eth_weight * (1 - staking_pct)
+    redemptions = np.where(deltas > 0, (deltas + free_eth) / eth_weight, 0.0)
+    return redemptions, deltas[:, None] * unit_weights[None, :]
+
+
+# sensitivity_kernel(deltas, eth_weight, staking_pct, unit_weights)
+#     -> (redemptions, active_matrix)
+#
+# Active weights scale linearly with delta_eth, so each row of active_matrix is
+# delta × unit_weights (the optimal weights for a unit ETH overweight). The
+# redemption producing each delta inverts Episode.from_redemption.
+if HAS_NUMBA:
+    sensitivity_kernel = njit(cache=True, fastmath=True)(_sensitivity_loop)
+else:
+    sensitivity_kernel = _sensitivity_numpy
+
+
+def _mc_te_loop(
+    n_redemptions: NDArray[np.int64],
+    redemptions: NDArray[np.float64],
+    base_k: float,
+    threshold: float,
+    episode_days: float,
+) -> NDArray[np.float64]:
+    """Per-simulation tracking error from flat draws (compiled by Numba)"""
+    n_sims = n_redemptions.shape[0]
+    te_values = np.empty(n_sims)
+
+    # Offset of each simulation's draws, so simulations run independently
+    starts = np.empty(n_sims, dtype=np.int64)
+    offset = 0
+    for i in range(n_sims):
+        starts[i] = offset
+        offset += n_redemptions[i]
+
+    for i in prange(n_sims):
+        total = 0.0
+        for j in range(starts[i], starts[i] + n_redemptions[i]):
+            diff = redemptions[j] - threshold
+            if diff > 0.0:
+                total += diff * diff
+        te_values[i] = np.sqrt(base_k * total * episode_days)
+
+    return te_values
+
+
+def _mc_te_numpy(
+    n_redemptions: NDArray[np.int64],
+    redemptions: NDArray[np.float64],
+    base_k: float,
+    threshold: float,
+    episode_days: float,
+) -> NDArray[np.float64]:
+    """NumPy fallback for mc_te_kernel"""
+    n_sims = n_redemptions.shape[0]
+    diff = np.maximum(redemptions - threshold, 0.0)
+    owner = np.repeat(np.arange(n_sims), n_redemptions)
+    total_var = np.bincount(owner, weights=base_k * diff * diff, minlength=n_sims)
+    return np.sqrt(total_var * episode_days)
+
+
+# mc_te_kernel(n_redemptions, redemptions, base_k, threshold, episode_days)
+#     -> te_values
+#
+# Simulation i owns the next n_redemptions[i] entries of the flat redemptions
+# array; its TE is sqrt(Σ base_k × max(0, r - threshold)² × episode_days).
+# Simulations are independent, so the compiled loop runs them across threads.
+if HAS_NUMBA:
+    mc_te_kernel = njit(cache=True, fastmath=True, parallel=True)(_mc_te_loop)
+else:
+    mc_te_kernel = _mc_te_numpy
+
+
+def _expectations_loop(
+    values: NDArray[np.float64],
+    probs: NDArray[np.float64],
+    tau_eth: float,
+    tau_sol: float,
+    k_eth_eth: float,
+    k_eth_sol: float,
+    k_sol_sol: float,
+) -> Tuple[float, float, float, float, float]:
+    """Two-asset excess expectations in one pass (compiled by Numba)"""
+    exp_eth_squared = 0.0
+    exp_sol_squared = 0.0
+    exp_cross_term = 0.0
+
+    for k in range(values.shape[0]):
+        excess_eth = values[k] - tau_eth
+        excess_eth = excess_eth if excess_eth > 0.0 else 0.0
+        excess_sol = values[k] - tau_sol
+        excess_sol = excess_sol if excess_sol > 0.0 else 0.0
+
+        p = probs[k]
+        exp_eth_squared += p * excess_eth * excess_eth
+        exp_sol_squared += p * excess_sol * excess_sol
+        exp_cross_term += p * excess_eth * excess_sol
+
+    exp_var_partial = k_eth_eth * exp_eth_squared
+    exp_var_full = (
+        exp_var_partial + 2.0 * k_eth_sol * exp_cross_term + k_sol_sol * exp_sol_squared
+    )
+    return (
+        exp_var_full,
+        exp_var_partial,
+        exp_eth_squared,
+        exp_sol_squared,
+        exp_cross_term,
+    )
+
+
+def _expectations_numpy(
+    values: NDArray[np.float64],
+    probs: NDArray[np.float64],
+    tau_eth: float,
+    tau_sol: float,
+    k_eth_eth: float,
+    k_eth_sol: float,
+    k_sol_sol: float,
+) -> Tuple[float, float, float, float, float]:
+    """NumPy fallback for expectations_kernel"""
+    excess_eth = np.maximum(0.0, values - tau_eth)
+    excess_sol = np.maximum(0.0, values - tau_sol)
+
+    exp_eth_squared = float(probs @ (excess_eth * excess_eth))
+    exp_sol_squared = float(probs @ (excess_sol * excess_sol))
+    exp_cross_term = float(probs @ (excess_eth * excess_sol))
+
+    exp_var_partial = k_eth_eth * exp_eth_squared
+    exp_var_full = (
+        exp_var_partial + 2 * k_eth_sol * exp_cross_term + k_sol_sol * exp_sol_squared
+    )
+    return (
+        exp_var_full,
+        exp_var_partial,
+        exp_eth_squared,
+        exp_sol_squared,
+        exp_cross_term,
+    )
+
+
+# expectations_kernel(values, probs, tau_eth, tau_sol, k_eth_eth, k_eth_sol,
+#                     k_sol_sol)
+#     -> (E[Var_full], E[Var_partial], E[(R-τ_ETH)²₊], E[(R-τ_SOL)²₊],
+#         E[(R-τ_ETH)₊ (R-τ_SOL)₊])
+#
+# The variance expectations are linear in the three excess expectations, so a
+# single pass over the pmf yields all five.
+if HAS_NUMBA:
+    expectations_kernel = njit(cache=True, fastmath=True)(_expectations_loop)
+else:
+    expectations_kernel = _expectations_numpy
@@ -9,6 +9,8 @@ and redemption percentage, accounting for the non-constant k_factor.
 from __future__ import annotations
 from dataclasses import dataclass
 from math import sqrt
+import numpy as np
+from numpy.typing import NDArray
 
 
 @dataclass(frozen=True)
@@ -52,6 +54,16 @@ class VarianceModel:
             return 0.0
         return self.base_k * (redemption_pct - self.redemption_threshold) ** 2
 
+    def delta_eth_v(self, redemption_pct: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Vectorized delta_eth over an array of redemption percentages"""
+        r = np.asarray(redemption_pct, dtype=np.float64)
+        return self.eth_weight * np.maximum(0.0, r - self.redemption_threshold)
+
+    def variance_v(self, redemption_pct: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Vectorized variance over an array of redemption percentages"""
+        r = np.asarray(redemption_pct, dtype=np.float64)
+        return self.base_k * np.maximum(0.0, r - self.redemption_threshold) ** 2
+
     def effective_k_factor(self, redemption_pct: float) -> float:
         """
         The 'k_factor' if we were to express variance = k_factor × redemption_pct².
@@ -125,15 +137,19 @@ def demonstrate_k_factor_variation():
     print('\nRedemption   Delta_ETH   Variance    k_factor    Ratio to k')
     print('-' * 60)
 
-    redemptions = [0.15, 0.20, 0.25, 0.30, 0.40, 0.50, 0.75, 1.00]
-    model.effective_k_factor(1.0)
+    redemptions = np.array([0.15, 0.20, 0.25, 0.30, 0.40, 0.50, 0.75, 1.00])
 
-    for r in redemptions:
-        delta = model.delta_eth(r)
-        var = model.variance(r)
-        k_eff = model.effective_k_factor(r)
-        ratio = k_eff / model.base_k if model.base_k > 0 else 0
+    # All redemption levels at once
+    deltas = model.delta_eth_v(redemptions)
+    variances = model.variance_v(redemptions)
+    k_effs = np.where(
+        redemptions > model.redemption_threshold, variances / redemptions**2, 0.0
+    )
+    ratios = k_effs / model.base_k if model.base_k > 0 else np.zeros_like(k_effs)
 
+    for r, delta, var, k_eff, ratio in zip(
+        redemptions, deltas, variances, k_effs, ratios
+    ):
         print(f'{r:6.1%}      {delta:8.4f}   {var:8.6f}   {k_eff:8.6f}   {ratio:6.3f}')
 
     print('\nKey insight: k_factor approaches base_k × staking_pct² as r → 1')
@@ -13,9 +13,16 @@ Tables generated:
 """
 
 from __future__ import annotations
+import io
+import sys
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Tuple
 import numpy as np
 import pandas as pd
+from numpy.typing import NDArray
+
+from core._fast_kernels import sensitivity_kernel
 
 # Import shared components from v4
 from core.optimal_eth_over_te_dynamic import (
@@ -23,21 +30,100 @@ from core.optimal_eth_over_te_dynamic import (
     StakingConfig,
     Episode,
     EpisodicAnalyzer,
-    CovarianceBuilder,
-    ActiveWeightOptimizer,
-    RedemptionPattern,
+    RedemptionSchedule,
+    get_covariance_builder,
+    get_optimizer,
 )
 
 
 # ---------- Sensitivity Analysis Functions ------------------------------- #
 
+# Table 4 columns, in the order _staking_metrics_row formats them
+METRIC_COLS = [
+    '% ETH Staked',
+    'Total Annual TE',
+    'Overweight Benefits',
+    'Extra Staking Benefits',
+    'Expected Shortfall',
+    'Net (Overweight)',
+    'Total Net Benefit',
+]
+
+# PortfolioResults fields behind the Table 4 columns, fetched in one C call
+_RESULT_FIELDS = attrgetter(
+    'total_annual_te',
+    'staking_benefits',
+    'extra_staking_benefit',
+    'expected_shortfall',
+    'net_overweight',
+    'net_benefit',
+)
+
+
+@lru_cache(maxsize=None)
+def _grid(spec: Tuple[float, float, float]) -> NDArray[np.float64]:
+    """
+    Shared read-only grid for a (start, stop, step) range.
+
+    Keeps np.arange's point count (the tables rely on e.g. 70%..100% staked)
+    but snaps values to the decimal grid, removing the accumulated float drift
+    of arange (0.7999999999999999 instead of 0.8).
+    """
+    start, _, step = spec
+    n = len(np.arange(*spec))
+    grid = np.round(start + step * np.arange(n), 12)
+    grid.setflags(write=False)
+    return grid
+
+
+@lru_cache(maxsize=None)
+def _staking_cfg(
+    staking_pct: float, annual_yield: float, eth_weight: float, baseline_staking: float
+) -> StakingConfig:
+    """Shared (immutable) StakingConfig per parameter combination"""
+    return StakingConfig(
+        eth_staking_pct=staking_pct,
+        annual_yield=annual_yield,
+        eth_weight=eth_weight,
+        baseline_staking=baseline_staking,
+    )
+
+
+def _staking_metrics_row(
+    args: Tuple[MarketConfig, RedemptionSchedule, float, float, float],
+) -> Tuple[str, ...]:
+    """Formatted Table 4 row for one staking level"""
+    config, schedule, staking_pct, base_yield, baseline_staking = args
+
+    # Run analysis
+    staking_cfg = _staking_cfg(
+        float(staking_pct), base_yield, config.eth_weight, baseline_staking
+    )
+    analyzer = EpisodicAnalyzer(config, staking_cfg)
+    results = analyzer.analyze_schedule_fast(schedule)
+
+    # Row using fields from PortfolioResults
+    te, benefits, extra, shortfall, net_ow, net = _RESULT_FIELDS(results)
+    return (
+        f'{staking_pct:.0%}',
+        f'{te:.2%}',
+        f'{benefits:.4%}',
+        f'{extra:.4%}',
+        f'{shortfall:.4%}',
+        f'{net_ow:+.4%}',
+        f'{net:+.4%}',
+    )
+
 
 class SensitivityAnalyzer:
     """Generates sensitivity analysis tables"""
 
     def __init__(self, config: MarketConfig):
         self.config = config
-        self.cov_builder = CovarianceBuilder(config)
+
+        # Covariance factorization is shared by every table for this market
+        self.cov_builder = get_covariance_builder(config)
+        self.optimizer = get_optimizer(config)
 
     def delta_eth_sensitivity(
         self,
@@ -54,29 +140,24 @@ class SensitivityAnalyzer:
         Returns:
             DataFrame with staking % as rows, redemption % as columns
         """
-        redemptions = np.arange(*redemption_range)
-        stakings = np.arange(*staking_range)
-
-        # Calculate delta_eth for each combination
-        data = []
-        for staking in stakings:
-            row = []
-            for redemption in redemptions:
-                episode = Episode.from_redemption(
-                    redemption, 10, self.config.eth_weight, staking
-                )
-                row.append(episode.delta_eth)
-            data.append(row)
+        redemptions = _grid(tuple(redemption_range))
+        stakings = _grid(tuple(staking_range))
+
+        # Every combination at once: stakings along rows, redemptions along
+        # columns
+        delta = Episode.compute_delta_eth(
+            redemptions[None, :], self.config.eth_weight, stakings[:, None]
+        )
 
         return pd.DataFrame(
-            data,
+            delta,
             index=[f'{s:.0%} staked' for s in stakings],
             columns=[f'{r:.0%}' for r in redemptions],
         )
 
     def active_weights_sensitivity(
         self, delta_range: Tuple[float, float, float], staking_pct: float = 0.8
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, NDArray[np.float64]]:
         """
         Table 2/3: Optimal active weights for various ETH overweights
 
@@ -85,39 +166,34 @@ class SensitivityAnalyzer:
             staking_pct: Assumed staking percentage for redemption mapping
 
         Returns:
-            DataFrame with delta_eth levels and corresponding active weights
+            DataFrame with delta_eth levels and corresponding active weights,
+            and the raw (n_delta, n_assets) active weight matrix
         """
-        optimizer = ActiveWeightOptimizer(self.cov_builder.matrix)
-        delta_values = np.arange(*delta_range)
-
-        data = []
-        for delta_eth in delta_values:
-            # Calculate optimal weights
-            active = optimizer.optimize(delta_eth)
-
-            # Find corresponding redemption
-            redemption = self._inverse_redemption(delta_eth, staking_pct)
-
-            # Build row
-            row = {'Delta ETH': f'{delta_eth:.2%}', 'Redemption %': f'{redemption:.1%}'}
-            for asset, weight in zip(self.config.assets, active):
-                row[asset] = f'{weight:+.4f}'
-
-            data.append(row)
-
-        return pd.DataFrame(data)
-
-    def _inverse_redemption(self, delta_eth: float, staking_pct: float) -> float:
-        """Calculate redemption percentage that produces given delta_eth"""
-        if delta_eth <= 0:
-            return 0.0
+        delta_values = _grid(tuple(delta_range))
+
+        # Optimal weights are linear in delta_eth: scale the unit solution and
+        # map each delta back to its redemption in one compiled pass
+        redemptions, active_matrix = sensitivity_kernel(
+            delta_values,
+            self.config.eth_weight,
+            staking_pct,
+            self.optimizer.optimize(1.0),
+        )
 
-        free_eth = self.config.eth_weight * (1 - staking_pct)
-        return (delta_eth + free_eth) / self.config.eth_weight
+        # Format whole columns at once (C-level printf instead of f-strings)
+        df = pd.DataFrame({
+            'Delta ETH': np.char.mod('%.2f%%', delta_values * 100),
+            'Redemption %': np.char.mod('%.1f%%', redemptions * 100),
+            **{
+                asset: np.char.mod('%+.4f', active_matrix[:, i])
+                for i, asset in enumerate(self.config.assets)
+            },
+        })
+        return df, active_matrix
 
     def metrics_by_staking(
         self,
-        schedule: List[RedemptionPattern],
+        schedule: RedemptionSchedule,
         staking_range: Tuple[float, float, float],
         base_yield: float = 0.05,
         baseline_staking: float = 0.7,
@@ -126,7 +202,7 @@ class SensitivityAnalyzer:
         Table 4: Key metrics sensitivity to staking percentage
 
         Args:
-            schedule: Redemption patterns to analyze
+            schedule: Redemption patterns to analyze (tuples or (n, 3) array)
             staking_range: (start, stop, step) for staking percentages
             base_yield: Annual staking yield
             baseline_staking: Baseline staking level for comparison
@@ -134,33 +210,15 @@ class SensitivityAnalyzer:
         Returns:
             DataFrame with metrics for each staking level
         """
-        stakings = np.arange(*staking_range)
-        data = []
-
-        for staking_pct in stakings:
-            # Run analysis
-            staking_cfg = StakingConfig(
-                eth_staking_pct=staking_pct,
-                annual_yield=base_yield,
-                eth_weight=self.config.eth_weight,
-                baseline_staking=baseline_staking,
-            )
-            analyzer = EpisodicAnalyzer(self.config, staking_cfg)
-            results = analyzer.analyze_schedule(schedule)
-
-            # Build row using fields from PortfolioResults
-            row = {
-                '% ETH Staked': f'{staking_pct:.0%}',
-                'Total Annual TE': f'{results.total_annual_te:.2%}',
-                'Overweight Benefits': f'{results.staking_benefits:.4%}',
-                'Extra Staking Benefits': f'{results.extra_staking_benefit:.4%}',
-                'Expected Shortfall': f'{results.expected_shortfall:.4%}',
-                'Net (Overweight)': f'{results.net_overweight:+.4%}',
-                'Total Net Benefit': f'{results.net_benefit:+.4%}',
-            }
-            data.append(row)
-
-        return pd.DataFrame(data)
+        stakings = _grid(tuple(staking_range))
+
+        jobs = [
+            (self.config, schedule, staking_pct, base_yield, baseline_staking)
+            for staking_pct in stakings
+        ]
+        rows = [_staking_metrics_row(job) for job in jobs]
+
+        return pd.DataFrame.from_records(rows, columns=METRIC_COLS)
 
     def portfolio_yield_table(
         self, staking_range: Tuple[float, float, float], yield_scenarios: List[float]
@@ -175,19 +233,20 @@ class SensitivityAnalyzer:
         Returns:
             DataFrame with portfolio yields
         """
-        stakings = np.arange(*staking_range)
-        data = []
-
-        for staking_pct in stakings:
-            row = {'% ETH Staked': f'{staking_pct:.0%}'}
+        stakings = _grid(tuple(staking_range))
+        yields = np.asarray(yield_scenarios, dtype=np.float64)
 
-            for yield_rate in yield_scenarios:
-                portfolio_yield = self.config.eth_weight * staking_pct * yield_rate
-                row[f'{yield_rate:.0%} Yield'] = f'{portfolio_yield:.3%}'
+        # Portfolio yield for every (staking, yield) pair: one outer product
+        portfolio_yields = self.config.eth_weight * stakings[:, None] * yields[None, :]
 
-            data.append(row)
-
-        return pd.DataFrame(data)
+        # One formatted column per yield scenario (Python loops only over yields)
+        return pd.DataFrame({
+            '% ETH Staked': np.char.mod('%.0f%%', stakings * 100),
+            **{
+                f'{y:.0%} Yield': np.char.mod('%.3f%%', portfolio_yields[:, j] * 100)
+                for j, y in enumerate(yields)
+            },
+        })
 
 
 # ---------- Report Generation -------------------------------------------- #
@@ -200,22 +259,30 @@ class SensitivityReporter:
         self.config = config
         self.analyzer = SensitivityAnalyzer(config)
 
+        # Staking levels shared by Tables 1, 4 and 5 (one cached grid)
+        self.staking_range = (0.70, 1.0, 0.10)
+
     def generate_all_tables(self):
         """Generate and display all sensitivity tables"""
 
         # Table 1: Delta ETH sensitivity
-        print('\n' + '=' * 80)
-        print('TABLE 1: ETH Overweight (delta_eth) Sensitivity Analysis')
-        print('=' * 80)
-        print(f'ETH Benchmark Weight: {self.config.eth_weight:.2%}')
-        print('\nRows: ETH Staking Percentage')
-        print('Columns: NAV Redemption Percentage')
-        print('-' * 80)
+        buf = io.StringIO()
+        print('\n' + '=' * 80, file=buf)
+        print('TABLE 1: ETH Overweight (delta_eth) Sensitivity Analysis', file=buf)
+        print('=' * 80, file=buf)
+        print(f'ETH Benchmark Weight: {self.config.eth_weight:.2%}', file=buf)
+        print('\nRows: ETH Staking Percentage', file=buf)
+        print('Columns: NAV Redemption Percentage', file=buf)
+        print('-' * 80, file=buf)
 
         df1 = self.analyzer.delta_eth_sensitivity(
-            redemption_range=(0.05, 0.50, 0.05), staking_range=(0.70, 1.0, 0.10)
+            redemption_range=(0.05, 0.50, 0.05), staking_range=self.staking_range
         )
-        print(df1.map(lambda x: f'{x:.3%}').to_string())
+        # Format while rendering (no second, all-object frame); col_space keeps
+        # the column layout of the pre-formatted string table
+        df1.to_string(buf=buf, float_format=lambda x: f'{x:.3%}', col_space=7)
+        buf.write('\n')
+        sys.stdout.write(buf.getvalue())
 
         # Table 2: Active weights at 90% staking
         self._print_active_weights(0.90, table_num=2)
@@ -234,92 +301,123 @@ class SensitivityReporter:
 
     def _print_active_weights(self, staking_pct: float, table_num: int):
         """Display active weights table"""
-        print('\n' + '=' * 80)
-        print(f'TABLE {table_num}: Optimal Active Weights for Various ETH Overweights')
-        print('=' * 80)
-        print(f'Assuming {staking_pct:.0%} ETH staking for redemption mapping')
-        print('-' * 80)
+        buf = io.StringIO()
+        print('\n' + '=' * 80, file=buf)
+        print(
+            f'TABLE {table_num}: Optimal Active Weights for Various ETH Overweights',
+            file=buf,
+        )
+        print('=' * 80, file=buf)
+        print(
+            f'Assuming {staking_pct:.0%} ETH staking for redemption mapping', file=buf
+        )
+        print('-' * 80, file=buf)
 
-        df = self.analyzer.active_weights_sensitivity(
+        df, active_matrix = self.analyzer.active_weights_sensitivity(
             delta_range=(0.005, 0.085, 0.005), staking_pct=staking_pct
         )
-        print(df.to_string(index=False))
+        df.to_string(index=False, buf=buf)
+        buf.write('\n')
 
         # Weight ranges summary
-        print('\n' + '-' * 80)
-        print('ACTIVE WEIGHT RANGES:')
-        print('-' * 80)
-
-        # Calculate ranges for each asset
-        optimizer = ActiveWeightOptimizer(self.analyzer.cov_builder.matrix)
-        for i, asset in enumerate(self.config.assets):
-            weights = []
-            for delta in np.arange(0.005, 0.085, 0.005):
-                active = optimizer.optimize(delta)
-                weights.append(active[i])
-
-            weight_range = max(weights) - min(weights)
-            if weight_range > 1e-6:
-                print(f'{asset}: {min(weights):+.4f} to {max(weights):+.4f}')
+        print('\n' + '-' * 80, file=buf)
+        print('ACTIVE WEIGHT RANGES:', file=buf)
+        print('-' * 80, file=buf)
+
+        # Calculate ranges for each asset from the weights behind the table
+        mins = active_matrix.min(axis=0)
+        maxs = active_matrix.max(axis=0)
+        for asset, low, high in zip(self.config.assets, mins, maxs):
+            if high - low > 1e-6:
+                print(f'{asset}: {low:+.4f} to {high:+.4f}', file=buf)
+
+        sys.stdout.write(buf.getvalue())
 
     def _print_metrics_sensitivity(self):
         """Display metrics sensitivity table"""
-        schedule = [
-            (0.05, 12, 10),
-            (0.10, 3, 10),
-            (0.20, 2, 10),
-            (0.30, 1, 10),
-        ]
+        # (redemption_pct, count, duration_days) rows
+        schedule = np.array(
+            [
+                [0.05, 12, 10],
+                [0.10, 3, 10],
+                [0.20, 2, 10],
+                [0.30, 1, 10],
+            ],
+            dtype=np.float64,
+        )
 
-        print('\n' + '=' * 80)
-        print('TABLE 4: Key Metrics Sensitivity to ETH Staking Percentage')
-        print('=' * 80)
-        print('Redemption schedule: 5% (12x), 10% (3x), 20% (2x), 30% (1x)')
-        print('Staking Yield: 5% annual, Baseline: 70%')
-        print('-' * 80)
+        buf = io.StringIO()
+        print('\n' + '=' * 80, file=buf)
+        print('TABLE 4: Key Metrics Sensitivity to ETH Staking Percentage', file=buf)
+        print('=' * 80, file=buf)
+        print('Redemption schedule: 5% (12x), 10% (3x), 20% (2x), 30% (1x)', file=buf)
+        print('Staking Yield: 5% annual, Baseline: 70%', file=buf)
+        print('-' * 80, file=buf)
 
         df = self.analyzer.metrics_by_staking(
             schedule=schedule,
-            staking_range=(0.70, 1.0, 0.10),
+            staking_range=self.staking_range,
             base_yield=0.05,
             baseline_staking=0.70,
         )
-        print(df.to_string(index=False))
+        df.to_string(index=False, buf=buf)
+        buf.write('\n')
+
+        print('\n' + '-' * 80, file=buf)
+        print('INSIGHTS:', file=buf)
+        print('- Extra staking benefits: from staking above 70% baseline', file=buf)
+        print('- Total net benefit includes all value sources', file=buf)
+        print(
+            '- Higher staking → higher tracking error but also higher benefits',
+            file=buf,
+        )
 
-        print('\n' + '-' * 80)
-        print('INSIGHTS:')
-        print('- Extra staking benefits: from staking above 70% baseline')
-        print('- Total net benefit includes all value sources')
-        print('- Higher staking → higher tracking error but also higher benefits')
+        sys.stdout.write(buf.getvalue())
 
     def _print_portfolio_yields(self):
         """Display portfolio yield table"""
-        print('\n' + '=' * 80)
-        print('TABLE 5: Expected Portfolio Annual Yield from ETH Staking')
-        print('=' * 80)
-        print(f'ETH Benchmark Weight: {self.config.eth_weight:.2%}')
-        print('Portfolio yield = ETH weight × % staked × staking yield')
-        print('-' * 80)
+        buf = io.StringIO()
+        print('\n' + '=' * 80, file=buf)
+        print('TABLE 5: Expected Portfolio Annual Yield from ETH Staking', file=buf)
+        print('=' * 80, file=buf)
+        print(f'ETH Benchmark Weight: {self.config.eth_weight:.2%}', file=buf)
+        print('Portfolio yield = ETH weight × % staked × staking yield', file=buf)
+        print('-' * 80, file=buf)
 
         df = self.analyzer.portfolio_yield_table(
-            staking_range=(0.70, 1.0, 0.10), yield_scenarios=[0.03, 0.05, 0.08]
+            staking_range=self.staking_range, yield_scenarios=[0.03, 0.05, 0.08]
         )
-        print(df.to_string(index=False))
+        df.to_string(index=False, buf=buf)
+        buf.write('\n')
+
+        print('\n' + '-' * 80, file=buf)
+        print("NOTE: Portfolio yields reflect ETH's 10.49% benchmark weight", file=buf)
+        print('Maximum yield (100% staked, 8% rate): 0.839% portfolio return', file=buf)
 
-        print('\n' + '-' * 80)
-        print("NOTE: Portfolio yields reflect ETH's 10.49% benchmark weight")
-        print('Maximum yield (100% staked, 8% rate): 0.839% portfolio return')
+        sys.stdout.write(buf.getvalue())
 
     def _print_insights(self):
         """Display summary insights"""
-        print('\n' + '=' * 80)
-        print('KEY INSIGHTS:')
-        print('=' * 80)
-        print('1. ETH overweight increases linearly with redemptions above free ETH')
-        print('2. Risk-minimizing weights primarily underweight BTC')
-        print('3. Higher staking enables more yield but increases tracking error')
-        print('4. Net benefits can remain positive even with higher tracking risk')
-        print("5. Portfolio yields are modest due to ETH's 10.49% weight")
+        buf = io.StringIO()
+        print('\n' + '=' * 80, file=buf)
+        print('KEY INSIGHTS:', file=buf)
+        print('=' * 80, file=buf)
+        print(
+            '1. ETH overweight increases linearly with redemptions above free ETH',
+            file=buf,
+        )
+        print('2. Risk-minimizing weights primarily underweight BTC', file=buf)
+        print(
+            '3. Higher staking enables more yield but increases tracking error',
+            file=buf,
+        )
+        print(
+            '4. Net benefits can remain positive even with higher tracking risk',
+            file=buf,
+        )
+        print("5. Portfolio yields are modest due to ETH's 10.49% weight", file=buf)
+
+        sys.stdout.write(buf.getvalue())
 
 
 # ---------- Main Entry Point --------------------------------------------- #
@@ -15,19 +15,152 @@ Key improvements:
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Tuple, List, Dict, Any
+import sys
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Tuple, List, Dict, Any, Optional
 from math import sqrt
 import numpy as np
-from scipy import stats, integrate
+from scipy import stats
+from scipy.linalg import cho_factor, cho_solve
+from scipy.special import betainc, betaln, comb, ndtri
+from numpy.polynomial.legendre import leggauss
 from numpy.typing import NDArray
-from core.optimal_eth_over_te_dynamic import MarketConfig, CovarianceBuilder
+from core._fast_kernels import mc_te_kernel
+from core.optimal_eth_over_te_dynamic import MarketConfig, get_covariance_builder
 
 
 # Type aliases
 RedemptionDist = stats.rv_continuous | stats.rv_discrete
 VarianceResult = Dict[str, float]
 
+# Gauss-Legendre rule for smooth moment integrands (exact for polynomials up
+# to degree 63)
+_GL_NODES, _GL_WEIGHTS = leggauss(32)
+
+
+def _is_discrete(dist: RedemptionDist) -> bool:
+    """True for rv_discrete instances and frozen discrete distributions"""
+    return isinstance(dist, stats.rv_discrete) or isinstance(
+        getattr(dist, 'dist', None), stats.rv_discrete
+    )
+
+
+def _discrete_arrays(
+    dist: RedemptionDist,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Support points and probabilities of a discrete distribution as arrays.
+
+    Exact for every discrete form: custom rv_discrete(values=...) exposes
+    xk/pk (also through a frozen wrapper, shifted by loc); integer-valued
+    families are enumerated over their support with pmf, truncating an
+    infinite upper tail at probability 1e-12.
+    """
+    # For custom rv_discrete, we can access the values directly
+    if hasattr(dist, 'xk') and hasattr(dist, 'pk'):
+        return (
+            np.asarray(dist.xk, dtype=np.float64),
+            np.asarray(dist.pk, dtype=np.float64),
+        )
+
+    base = getattr(dist, 'dist', None)
+    if hasattr(base, 'xk') and hasattr(base, 'pk'):
+        loc = dist.kwds.get('loc', dist.args[0] if dist.args else 0.0)
+        return (
+            np.asarray(base.xk, dtype=np.float64) + loc,
+            np.asarray(base.pk, dtype=np.float64),
+        )
+
+    # Integer-valued family: enumerate the support
+    lower, upper = dist.support()
+    if not np.isfinite(upper):
+        upper = dist.ppf(1 - 1e-12)
+    values = np.arange(lower, upper + 1, dtype=np.float64)
+    return values, np.asarray(dist.pmf(values), dtype=np.float64)
+
+
+def _upper_limit(dist: RedemptionDist) -> float:
+    """
+    Upper integration limit for redemption moments: min(1, end of support).
+
+    Stopping at the end of the support keeps the pdf's jump to zero (e.g. for
+    a uniform on [0, 0.5]) out of the interval, so quad needs a single
+    21-point pass instead of repeated subdivision.
+    """
+    return min(1.0, float(dist.support()[1]))
+
+
+def _beta_family_moment(
+    dist: RedemptionDist, threshold: float, order: int
+) -> Optional[float]:
+    """
+    Closed-form E[max(0, R - threshold)^order] for (scaled) beta redemptions.
+
+    Covers frozen beta and uniform distributions (uniform is beta(1, 1)) whose
+    support ends at or below 100%. With R = loc + scale × Y, Y ~ Beta(a, b)
+    and u = (threshold - loc) / scale:
+
+        E[(R - t)₊ᵏ] = scaleᵏ × Σⱼ C(k, j) (-u)ᵏ⁻ʲ × E[Yʲ; Y > u]
+        E[Yʲ; Y > u] = B(a + j, b) / B(a, b) × (1 - I_u(a + j, b))
+
+    Returns None for other distributions (callers fall back to quad).
+    """
+    name = getattr(getattr(dist, 'dist', None), 'name', None)
+    if name == 'uniform':
+        a = b = 1.0
+    elif name == 'beta':
+        shapes = dict(zip(('a', 'b'), dist.args))
+        shapes.update({k: v for k, v in dist.kwds.items() if k in ('a', 'b')})
+        a, b = float(shapes['a']), float(shapes['b'])
+    else:
+        return None
+
+    lower, upper = (float(x) for x in dist.support())
+    if upper > 1.0:
+        return None  # moments are taken over redemptions up to 100% only
+
+    scale = upper - lower
+    u = (threshold - lower) / scale
+    if u >= 1.0:
+        return 0.0
+
+    # E[Yʲ; Y > u] for j = 0..order (upper regularized incomplete beta, via
+    # the symmetry 1 - I_u(p, q) = I_{1-u}(q, p))
+    j = np.arange(order + 1)
+    partial = np.exp(betaln(a + j, b) - betaln(a, b)) * betainc(
+        b, a + j, 1.0 - max(u, 0.0)
+    )
+    terms = comb(order, j) * (-u) ** (order - j) * partial
+    return max(float(scale**order * terms.sum()), 0.0)
+
+
+@lru_cache(maxsize=None)
+def _v_sigma_v(market: MarketConfig) -> float:
+    """Daily variance v' Σ v of the unit-overweight optimal active weights"""
+    # Build covariance matrix
+    cov_builder = get_covariance_builder(market)
+    cov_matrix = cov_builder.matrix
+
+    # Constraint matrix for Lagrange optimization
+    n = len(market.assets)
+    C = np.vstack([
+        np.ones(n),  # sum-to-zero
+        np.eye(n)[1],  # ETH-specific
+    ])
+
+    # Unit constraint vector e2 = [0, 1]'
+    e2 = np.array([0.0, 1.0])
+
+    # Compute v = Σ⁻¹ C' (C Σ⁻¹ C')⁻¹ e₂; Σ is symmetric positive definite, so
+    # Σ⁻¹ C' comes from a Cholesky factor and two triangular solves
+    inv_cov_ct = cho_solve(cho_factor(cov_matrix), C.T)
+    lambda_0 = np.linalg.solve(C @ inv_cov_ct, e2)
+    v = inv_cov_ct @ lambda_0
+
+    # Compute (v' Σ v) as a single einsum contraction
+    return float(np.einsum('i,ij,j->', v, cov_matrix, v, optimize=True))
+
 
 @dataclass(frozen=True)
 class VarianceParameters:
@@ -37,54 +170,35 @@ class VarianceParameters:
     staking_pct: float
     base_k: float  # eth_weight² × (v' Σ v)
 
-    @property
-    def threshold(self) -> float:
-        """Redemption threshold below which no overweight is needed"""
-        return 1 - self.staking_pct
+    # Redemption threshold below which no overweight is needed; derived once
+    # (the dataclass is frozen), so reads are plain attribute lookups
+    threshold: float = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'threshold', 1 - self.staking_pct)
 
     def variance(self, redemption_pct: float) -> float:
         """Daily variance as a function of redemption percentage"""
-        if redemption_pct <= self.threshold:
+        threshold = self.threshold
+        if redemption_pct <= threshold:
             return 0.0
-        return self.base_k * (redemption_pct - self.threshold) ** 2
+        return self.base_k * (redemption_pct - threshold) ** 2
 
     def delta_eth(self, redemption_pct: float) -> float:
         """ETH overweight for given redemption"""
-        if redemption_pct <= self.threshold:
+        threshold = self.threshold
+        if redemption_pct <= threshold:
             return 0.0
-        return self.eth_weight * (redemption_pct - self.threshold)
+        return self.eth_weight * (redemption_pct - threshold)
 
     @classmethod
     def from_market_config(
         cls, market: MarketConfig, staking_pct: float
     ) -> VarianceParameters:
         """Calculate base_k from market configuration"""
-        # Build covariance matrix and optimizer
-        cov_builder = CovarianceBuilder(market)
-        cov_matrix = cov_builder.matrix
-        inv_cov = np.linalg.inv(cov_matrix)
-
-        # Constraint matrix for Lagrange optimization
-        n = len(market.assets)
-        C = np.vstack([
-            np.ones(n),  # sum-to-zero
-            np.eye(n)[1],  # ETH-specific
-        ])
-
-        # Unit constraint vector e2 = [0, 1]'
-        e2 = np.array([0.0, 1.0])
-
-        # Compute v = Σ⁻¹ C' (C Σ⁻¹ C')⁻¹ e₂
-        C_inv_cov_C = C @ inv_cov @ C.T
-        lambda_0 = np.linalg.solve(C_inv_cov_C, e2)
-        v = inv_cov @ C.T @ lambda_0
-
-        # Compute (v' Σ v)
-        v_sigma_v = v @ cov_matrix @ v
-
-        # Calculate base_k
+        # Only staking_pct varies between calls: v' Σ v is cached per market
         eth_weight = market.eth_weight
-        base_k = eth_weight**2 * v_sigma_v
+        base_k = eth_weight**2 * _v_sigma_v(market)
 
         return cls(eth_weight=eth_weight, staking_pct=staking_pct, base_k=base_k)
 
@@ -115,6 +229,69 @@ class EnhancedStochasticModel:
         """Variance of redemption size Var[R]"""
         return float(self.redemption_dist.var())
 
+    @cached_property
+    def _discrete_active(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        (r - threshold, probability) for the discrete atoms above threshold.
+
+        Computed once per model; the distribution and variance parameters are
+        not reassigned after construction.
+        """
+        threshold = self.variance_params.threshold
+        values, probs = _discrete_arrays(self.redemption_dist)
+        mask = values > threshold
+        return values[mask] - threshold, probs[mask]
+
+    @cached_property
+    def _xk_cdf(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Discrete support and its cumulative probabilities (last entry 1)"""
+        values, probs = _discrete_arrays(self.redemption_dist)
+        cdf = np.cumsum(probs)
+        cdf /= cdf[-1]  # u < 1 always lands on a support point
+        return values, cdf
+
+    def _excess_moments(self, *orders: int) -> NDArray[np.float64]:
+        """
+        E[max(0, R - threshold)^k] for each order k, over redemptions up to 100%.
+
+        Discrete distributions use a weighted sum, beta-family ones a closed
+        form, anything else numerical integration. All orders share one pass
+        over the support (or the quadrature nodes).
+        """
+        threshold = self.variance_params.threshold
+        powers = np.asarray(orders)[:, None]
+
+        if _is_discrete(self.redemption_dist):
+            # Discrete distribution: weighted sums, as one matrix-vector product
+            diffs, probs = self._discrete_active
+            return diffs**powers @ probs
+
+        # Closed form for beta-family redemptions
+        moments = [
+            _beta_family_moment(self.redemption_dist, threshold, k) for k in orders
+        ]
+        if moments[0] is not None:
+            return np.array(moments)
+
+        # Otherwise a fixed Gauss-Legendre rule over the part of the support
+        # above the threshold, where the integrand is smooth: one vectorized
+        # pdf call on the nodes
+        lower = max(threshold, float(self.redemption_dist.support()[0]))
+        upper = _upper_limit(self.redemption_dist)
+        if upper <= lower:
+            return np.zeros(len(orders))
+        half_width = 0.5 * (upper - lower)
+        r = lower + half_width * (_GL_NODES + 1.0)
+        weights = half_width * _GL_WEIGHTS * self.redemption_dist.pdf(r)
+        return (r - threshold) ** powers @ weights
+
+    @cached_property
+    def _variance_moments(self) -> Tuple[float, float]:
+        """(E[f(R)], E[f(R)²]) for f(r) = base_k × max(0, r - threshold)²"""
+        base_k = self.variance_params.base_k
+        second, fourth = self._excess_moments(2, 4)
+        return base_k * float(second), base_k**2 * float(fourth)
+
     def expected_variance(self) -> float:
         """
         E[variance(R)] accounting for threshold effects.
@@ -122,39 +299,11 @@ class EnhancedStochasticModel:
         For continuous distributions, this requires integration.
         For discrete distributions, this is a weighted sum.
         """
-        threshold = self.variance_params.threshold
-        base_k = self.variance_params.base_k
+        return self._variance_moments[0]
 
-        if isinstance(self.redemption_dist, stats.rv_discrete):
-            # Discrete distribution: weighted sum
-            # For custom rv_discrete, we can access the values directly
-            if hasattr(self.redemption_dist, 'xk') and hasattr(
-                self.redemption_dist, 'pk'
-            ):
-                values = self.redemption_dist.xk
-                probs = self.redemption_dist.pk
-            else:
-                # Fallback to sampling to estimate
-                samples = self.redemption_dist.rvs(size=10000)
-                unique_vals, counts = np.unique(samples, return_counts=True)
-                values = unique_vals
-                probs = counts / counts.sum()
-
-            total = 0.0
-            for r, p in zip(values, probs):
-                if r > threshold:
-                    total += p * base_k * (r - threshold) ** 2
-            return total
-        else:
-            # Continuous distribution: numerical integration
-            def integrand(r):
-                if r <= threshold:
-                    return 0.0
-                return self.redemption_dist.pdf(r) * base_k * (r - threshold) ** 2
-
-            # Integrate from threshold to upper bound
-            result, _ = integrate.quad(integrand, threshold, 1.0)
-            return result
+    def expected_excess(self) -> float:
+        """E[max(0, R - threshold)]: expected redemption above the threshold"""
+        return float(self._excess_moments(1)[0])
 
     def analytical_tracking_error(self) -> float:
         """
@@ -173,41 +322,8 @@ class EnhancedStochasticModel:
         For independent R_i: Var[Σ f(R_i)] = λ × Var[f(R)]
         where f(r) = base_k × max(0, r - threshold)²
         """
-        threshold = self.variance_params.threshold
-        base_k = self.variance_params.base_k
-
-        # E[f(R)]
-        exp_f = self.expected_variance()
-
-        # E[f(R)²] = E[(base_k × (R - threshold)²)²] = base_k² × E[(R - threshold)⁴]
-        if isinstance(self.redemption_dist, stats.rv_discrete):
-            # Get values and probabilities
-            if hasattr(self.redemption_dist, 'xk') and hasattr(
-                self.redemption_dist, 'pk'
-            ):
-                values = self.redemption_dist.xk
-                probs = self.redemption_dist.pk
-            else:
-                # Fallback to sampling
-                samples = self.redemption_dist.rvs(size=10000)
-                unique_vals, counts = np.unique(samples, return_counts=True)
-                values = unique_vals
-                probs = counts / counts.sum()
-
-            exp_f_squared = sum(
-                p * (base_k * max(0, r - threshold) ** 2) ** 2
-                for r, p in zip(values, probs)
-            )
-        else:
-
-            def integrand(r):
-                if r <= threshold:
-                    return 0.0
-                return (
-                    self.redemption_dist.pdf(r) * (base_k * (r - threshold) ** 2) ** 2
-                )
-
-            exp_f_squared, _ = integrate.quad(integrand, threshold, 1.0)
+        # E[f(R)] and E[f(R)²] = base_k² × E[(R - threshold)⁴], from one pass
+        exp_f, exp_f_squared = self._variance_moments
 
         # Var[f(R)] = E[f(R)²] - E[f(R)]²
         var_f = exp_f_squared - exp_f**2
@@ -229,34 +345,51 @@ class EnhancedStochasticModel:
             te_var = var_sum_var * self.episode_days / (4 * te_mean**2)
             te_std = sqrt(te_var)
 
-            z_score = stats.norm.ppf((1 + confidence) / 2)
+            # Standard normal quantile without the scipy.stats dispatch layer
+            z_score = ndtri((1 + confidence) / 2)
             margin = z_score * te_std
 
             return (max(0, te_mean - margin), te_mean + margin)
         else:
             return (0.0, 0.0)
 
-    def simulate_tracking_error(self, n_simulations: int = 10000) -> NDArray:
+    def simulate_tracking_error(
+        self, n_simulations: int = 10000, rng: Optional[np.random.Generator] = None
+    ) -> NDArray:
         """
         Monte Carlo simulation with correct variance model.
-        """
-        te_values = np.zeros(n_simulations)
-
-        for i in range(n_simulations):
-            # Draw number of redemptions
-            n_redemptions = np.random.poisson(self.lambda_redemptions)
 
-            if n_redemptions > 0:
-                # Draw redemption sizes
-                redemptions = self.redemption_dist.rvs(size=n_redemptions)
-
-                # Calculate variance for each redemption
-                total_var = sum(self.variance_params.variance(r) for r in redemptions)
-
-                # Tracking error for this simulation
-                te_values[i] = sqrt(total_var * self.episode_days)
-
-        return te_values
+        Args:
+            n_simulations: Number of simulated periods
+            rng: Random generator (default: a fresh PCG64 default_rng()); pass
+                a seeded one for reproducible or per-worker streams
+        """
+        threshold = self.variance_params.threshold
+        base_k = self.variance_params.base_k
+        if rng is None:
+            rng = np.random.default_rng()
+
+        # Draw the number of redemptions of every simulation at once
+        n_redemptions = rng.poisson(self.lambda_redemptions, size=n_simulations)
+        total = int(n_redemptions.sum())
+
+        # Draw all redemption sizes in one call
+        if _is_discrete(self.redemption_dist):
+            # Inverse-CDF sampling on the cached cumulative probabilities
+            values, cdf = self._xk_cdf
+            redemptions = values[np.searchsorted(cdf, rng.random(total), side='right')]
+        else:
+            redemptions = self.redemption_dist.rvs(size=total, random_state=rng)
+
+        # Variance summed per simulation and converted to TE in one pass
+        # (Numba when available); simulations without redemptions get 0
+        return mc_te_kernel(
+            n_redemptions,
+            np.asarray(redemptions, dtype=np.float64),
+            base_k,
+            threshold,
+            float(self.episode_days),
+        )
 
     def analytical_derivatives(self) -> Dict[str, float]:
         """
@@ -277,21 +410,17 @@ class EnhancedStochasticModel:
             te / (2 * self.lambda_redemptions) if self.lambda_redemptions > 0 else 0
         )
 
-        # Numerical derivatives for complex distributions
-        eps = 1e-6
-
-        # Derivative with respect to staking percentage
-        # threshold = 1 - staking_pct, so ∂threshold/∂staking = -1
-        new_params = VarianceParameters(
-            self.variance_params.eth_weight,
-            self.variance_params.staking_pct + eps,
-            self.variance_params.base_k,
+        # Derivative with respect to staking percentage (closed form)
+        # threshold = 1 - staking_pct, so ∂threshold/∂staking = -1 and
+        # ∂E[f(R)]/∂staking = 2 × base_k × E[max(0, R - threshold)], giving
+        # ∂TE/∂staking = λ × days × base_k × E[max(0, R - threshold)] / TE
+        d_staking = (
+            self.lambda_redemptions
+            * self.episode_days
+            * self.variance_params.base_k
+            * self.expected_excess()
+            / te
         )
-        new_model = EnhancedStochasticModel(
-            self.lambda_redemptions, self.redemption_dist, new_params, self.episode_days
-        )
-        te_new = new_model.analytical_tracking_error()
-        d_staking = (te_new - te) / eps
 
         return {
             'd_lambda': d_lambda,
@@ -406,27 +535,12 @@ def sensitivity_analysis_enhanced(
     lambdas = np.linspace(lambda_range[0], lambda_range[1], 20)
     means = np.linspace(mean_range[0], mean_range[1], 20)
 
-    # Store results
-    te_grid = np.zeros((len(lambdas), len(means)))
-
-    for i, lam in enumerate(lambdas):
-        for j, mean in enumerate(means):
-            # Create distribution centered at mean
-            # Use two-point distribution for simplicity
-            if mean > var_params.threshold:
-                dist = stats.rv_discrete(values=([mean], [1.0]))
-            else:
-                # If mean below threshold, all variance is 0
-                dist = stats.rv_discrete(values=([mean], [1.0]))
-
-            model = EnhancedStochasticModel(
-                lambda_redemptions=lam,
-                redemption_dist=dist,
-                variance_params=var_params,
-                episode_days=10,
-            )
-
-            te_grid[i, j] = model.analytical_tracking_error()
+    # Every grid point is a one-point distribution at `mean`, so
+    # TE = √(λ × base_k × max(0, mean - threshold)² × days): one broadcast
+    episode_days = 10
+    te_grid = np.sqrt(lambdas[:, None] * var_params.base_k * episode_days) * (
+        np.maximum(means[None, :] - var_params.threshold, 0.0)
+    )
 
     # Calculate elasticities at center point
     center_i, center_j = len(lambdas) // 2, len(means) // 2
@@ -472,16 +586,17 @@ def demonstrate_non_constant_k():
     staking_pct = 0.8
     var_params = VarianceParameters.from_market_config(market, staking_pct)
 
-    print('\nNON-CONSTANT K-FACTOR DEMONSTRATION')
-    print('=' * 70)
-    print('Market Parameters:')
-    print(f'  ETH weight: {var_params.eth_weight:.4%}')
-    print(f'  Staking: {staking_pct:.0%}')
-    print(f'  Threshold: {var_params.threshold:.1%}')
-    print(f'  base_k: {var_params.base_k:.6f}')
-
-    print('\nRedemption   Variance    Naive k    Actual k    k/base_k   Error')
-    print('-' * 70)
+    lines = [
+        '\nNON-CONSTANT K-FACTOR DEMONSTRATION',
+        '=' * 70,
+        'Market Parameters:',
+        f'  ETH weight: {var_params.eth_weight:.4%}',
+        f'  Staking: {staking_pct:.0%}',
+        f'  Threshold: {var_params.threshold:.1%}',
+        f'  base_k: {var_params.base_k:.6f}',
+        '\nRedemption   Variance    Naive k    Actual k    k/base_k   Error',
+        '-' * 70,
+    ]
 
     redemptions = [0.15, 0.20, 0.25, 0.30, 0.40, 0.50, 0.75, 1.00]
     naive_k = var_params.base_k * staking_pct**2  # Naive assumption
@@ -492,13 +607,16 @@ def demonstrate_non_constant_k():
         k_ratio = actual_k / var_params.base_k if var_params.base_k > 0 else 0
         error = abs(naive_k - actual_k) / naive_k if naive_k > 0 else 0
 
-        print(
+        lines.append(
             f'{r:8.1%}   {variance:9.6f}  {naive_k:9.6f}  {actual_k:9.6f}  '
             f'{k_ratio:8.3f}  {error:7.1%}'
         )
 
-    print(f'\nNaive k assumes: k = base_k × staking_pct² = {naive_k:.6f}')
-    print('Actual k varies from 0 to base_k × staking_pct² as r increases')
+    lines.append(f'\nNaive k assumes: k = base_k × staking_pct² = {naive_k:.6f}')
+    lines.append('Actual k varies from 0 to base_k × staking_pct² as r increases')
+
+    # Emit the whole demonstration in one write
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
@@ -14,11 +14,14 @@ showing how the formula accounts for:
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
 from math import sqrt
 import numpy as np
 from numpy.typing import NDArray
 from scipy import stats
+from scipy.linalg import solve
+from core._fast_kernels import expectations_kernel
 
 
 @dataclass(frozen=True)
@@ -59,18 +62,22 @@ class TwoAssetConfig:
         return max(self.eth_unbonding_days, self.sol_unbonding_days)
 
 
-def compute_k_components(
-    market_cov: NDArray[np.float64], eth_idx: int = 1, sol_idx: int = 3
-) -> Dict[str, float]:
+def _spd_solve(A: NDArray[np.float64], B: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Solve A X = B for symmetric positive definite A (LAPACK posv)"""
+    return solve(A, B, assume_a='pos', overwrite_a=False, check_finite=False)
+
+
+@lru_cache(maxsize=None)
+def _constraint_system(
+    cov_key: bytes, n_assets: int, eth_idx: int, sol_idx: int
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
     """
-    Compute the k-components from Lagrange optimization.
+    Σ⁻¹ C' and C Σ⁻¹ C' for the three Lagrange constraints.
 
-    k_ETH_ETH = eth_weight² × (v_ETH' Σ v_ETH)
-    k_ETH_SOL = eth_weight × sol_weight × (v_ETH' Σ v_SOL)
-    k_SOL_SOL = sol_weight² × (v_SOL' Σ v_SOL)
+    Cached on the covariance matrix's raw bytes, so repeated calls with the
+    same market reuse a single Cholesky solve.
     """
-    n_assets = market_cov.shape[0]
-    inv_cov = np.linalg.inv(market_cov)
+    market_cov = np.frombuffer(cov_key).reshape(n_assets, n_assets)
 
     # Build constraint matrix C
     C = np.zeros((3, n_assets))
@@ -78,25 +85,45 @@ def compute_k_components(
     C[1, eth_idx] = 1  # ETH constraint
     C[2, sol_idx] = 1  # SOL constraint
 
-    # Compute (C Σ⁻¹ C')⁻¹
-    C_inv_cov_C = C @ inv_cov @ C.T
-    inv_C_inv_cov_C = np.linalg.inv(C_inv_cov_C)
+    # Σ is symmetric positive definite, so Σ⁻¹ C' comes from a Cholesky
+    # solve instead of an explicit inverse
+    inv_cov_ct = _spd_solve(market_cov, C.T)
+    C_inv_cov_C = C @ inv_cov_ct
+
+    # Shared between calls, so keep them read-only
+    inv_cov_ct.flags.writeable = False
+    C_inv_cov_C.flags.writeable = False
+    return inv_cov_ct, C_inv_cov_C
+
 
-    # Extract v_ETH and v_SOL
-    # v_ETH corresponds to unit vector [0, 1, 0]
-    e_eth = np.array([0.0, 1.0, 0.0])
-    lambda_eth = inv_C_inv_cov_C @ e_eth
-    v_eth = inv_cov @ C.T @ lambda_eth
+def compute_k_components(
+    market_cov: NDArray[np.float64], eth_idx: int = 1, sol_idx: int = 3
+) -> Dict[str, float]:
+    """
+    Compute the k-components from Lagrange optimization.
+
+    k_ETH_ETH = eth_weight² × (v_ETH' Σ v_ETH)
+    k_ETH_SOL = eth_weight × sol_weight × (v_ETH' Σ v_SOL)
+    k_SOL_SOL = sol_weight² × (v_SOL' Σ v_SOL)
+    """
+    market_cov = np.ascontiguousarray(market_cov, dtype=np.float64)
+    inv_cov_ct, C_inv_cov_C = _constraint_system(
+        market_cov.tobytes(), market_cov.shape[0], eth_idx, sol_idx
+    )
 
-    # v_SOL corresponds to unit vector [0, 0, 1]
-    e_sol = np.array([0.0, 0.0, 1.0])
-    lambda_sol = inv_C_inv_cov_C @ e_sol
-    v_sol = inv_cov @ C.T @ lambda_sol
+    # Extract v_ETH and v_SOL: both unit right-hand sides, e_ETH = [0, 1, 0]
+    # and e_SOL = [0, 0, 1], in one SPD solve (C Σ⁻¹ C' is positive definite)
+    E = np.eye(3)[:, 1:]
+    Lambda = _spd_solve(C_inv_cov_C, E)
+    V = inv_cov_ct @ Lambda
+    v_eth, v_sol = V[:, 0], V[:, 1]
 
-    # Compute variance components
-    v_eth_sigma_v_eth = v_eth @ market_cov @ v_eth
-    v_sol_sigma_v_sol = v_sol @ market_cov @ v_sol
-    v_eth_sigma_v_sol = v_eth @ market_cov @ v_sol
+    # Compute variance components. With v = Σ⁻¹ C' λ and C Σ⁻¹ C' λ = e,
+    # v_a' Σ v_b = λ_a' e_b, so the 2×2 Gram matrix V' Σ V is E' Λ
+    gram = E.T @ Lambda
+    v_eth_sigma_v_eth = gram[0, 0]
+    v_sol_sigma_v_sol = gram[1, 1]
+    v_eth_sigma_v_sol = gram[0, 1]
 
     return {
         'v_eth_sigma_v_eth': v_eth_sigma_v_eth,
@@ -107,8 +134,28 @@ def compute_k_components(
     }
 
 
+def build_k_scalars(
+    config: TwoAssetConfig, k_components: Dict[str, float]
+) -> NDArray[np.float64]:
+    """
+    Weight-scaled k-components as an array [k_ETH_ETH, k_ETH_SOL, k_SOL_SOL].
+
+    k_ETH_ETH = eth_weight² × (v_ETH' Σ v_ETH)
+    k_ETH_SOL = eth_weight × sol_weight × (v_ETH' Σ v_SOL)
+    k_SOL_SOL = sol_weight² × (v_SOL' Σ v_SOL)
+    """
+    return np.array([
+        config.eth_weight**2 * k_components['v_eth_sigma_v_eth'],
+        config.eth_weight * config.sol_weight * k_components['v_eth_sigma_v_sol'],
+        config.sol_weight**2 * k_components['v_sol_sigma_v_sol'],
+    ])
+
+
 def variance_full_period(
-    r: float, config: TwoAssetConfig, k_components: Dict[str, float]
+    r: float,
+    config: TwoAssetConfig,
+    k_components: Dict[str, float],
+    k_scalars: Optional[Sequence[float]] = None,
 ) -> float:
     """
     Calculate variance when both assets are overweighted (days 1-2).
@@ -116,17 +163,25 @@ def variance_full_period(
     Var_full(r) = k_ETH_ETH × (r - τ_ETH)²₊ +
                   2 × k_ETH_SOL × (r - τ_ETH)₊ × (r - τ_SOL)₊ +
                   k_SOL_SOL × (r - τ_SOL)²₊
+
+    Loops over many r can pass k_scalars = build_k_scalars(config,
+    k_components) once instead of rebuilding them from the dict per call.
     """
     # Calculate individual overweights
-    excess_eth = max(0, r - config.tau_eth)
-    excess_sol = max(0, r - config.tau_sol)
+    excess_eth = r - config.tau_eth
+    excess_eth = excess_eth if excess_eth > 0.0 else 0.0
+    excess_sol = r - config.tau_sol
+    excess_sol = excess_sol if excess_sol > 0.0 else 0.0
 
     # Compute k-components
-    k_eth_eth = config.eth_weight**2 * k_components['v_eth_sigma_v_eth']
-    k_sol_sol = config.sol_weight**2 * k_components['v_sol_sigma_v_sol']
-    k_eth_sol = (
-        config.eth_weight * config.sol_weight * k_components['v_eth_sigma_v_sol']
-    )
+    if k_scalars is None:
+        k_eth_eth = config.eth_weight**2 * k_components['v_eth_sigma_v_eth']
+        k_sol_sol = config.sol_weight**2 * k_components['v_sol_sigma_v_sol']
+        k_eth_sol = (
+            config.eth_weight * config.sol_weight * k_components['v_eth_sigma_v_sol']
+        )
+    else:
+        k_eth_eth, k_eth_sol, k_sol_sol = k_scalars
 
     # Calculate variance
     variance = (
@@ -139,21 +194,95 @@ def variance_full_period(
 
 
 def variance_partial_period(
-    r: float, config: TwoAssetConfig, k_components: Dict[str, float]
+    r: float,
+    config: TwoAssetConfig,
+    k_components: Dict[str, float],
+    k_scalars: Optional[Sequence[float]] = None,
 ) -> float:
     """
     Calculate variance when only ETH is overweighted (days 3-10).
 
     Var_partial(r) = k_ETH_ETH × (r - τ_ETH)²₊
     """
-    excess_eth = max(0, r - config.tau_eth)
-    k_eth_eth = config.eth_weight**2 * k_components['v_eth_sigma_v_eth']
+    excess_eth = r - config.tau_eth
+    excess_eth = excess_eth if excess_eth > 0.0 else 0.0
+    if k_scalars is None:
+        k_eth_eth = config.eth_weight**2 * k_components['v_eth_sigma_v_eth']
+    else:
+        k_eth_eth = k_scalars[0]
 
     return k_eth_eth * excess_eth**2
 
 
+@dataclass(frozen=True, eq=False)
+class DiscretePMF:
+    """
+    Finite redemption distribution as plain support/probability arrays.
+
+    A lightweight stand-in for stats.rv_discrete(values=(xk, pk)) when only
+    expectations are needed. Compared and hashed by identity, so one instance
+    shares its cached pmf across every expected_values_discrete call.
+    """
+
+    xk: NDArray[np.float64]
+    pk: NDArray[np.float64]
+
+    def __post_init__(self):
+        xk = np.array(self.xk, dtype=np.float64)
+        pk = np.array(self.pk, dtype=np.float64)
+        if xk.shape != pk.shape or xk.ndim != 1:
+            raise ValueError('xk and pk must be 1-D arrays of the same length')
+        xk.flags.writeable = False
+        pk.flags.writeable = False
+        object.__setattr__(self, 'xk', xk)
+        object.__setattr__(self, 'pk', pk)
+
+
+@lru_cache(maxsize=32)
+def _as_pmf(
+    redemption_dist: DiscretePMF | stats.rv_discrete,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Support points and probabilities of a discrete redemption distribution.
+
+    Custom rv_discrete(values=...) exposes xk/pk (also through a frozen
+    wrapper, shifted by loc); integer-valued families are enumerated over
+    their support with pmf. Cached per distribution object, and the arrays
+    are read-only.
+    """
+    if isinstance(redemption_dist, DiscretePMF):
+        return redemption_dist.xk, redemption_dist.pk
+    if hasattr(redemption_dist, 'xk') and hasattr(redemption_dist, 'pk'):
+        values = np.array(redemption_dist.xk, dtype=np.float64)
+        probs = np.array(redemption_dist.pk, dtype=np.float64)
+    elif hasattr(base := getattr(redemption_dist, 'dist', None), 'xk'):
+        # Frozen custom distribution: its values shifted by loc
+        loc = redemption_dist.kwds.get(
+            'loc', redemption_dist.args[0] if redemption_dist.args else 0.0
+        )
+        values = np.asarray(base.xk, dtype=np.float64) + loc
+        probs = np.array(base.pk, dtype=np.float64)
+    elif isinstance(redemption_dist, stats.rv_discrete) or isinstance(
+        base, stats.rv_discrete
+    ):
+        lower, upper = redemption_dist.support()
+        if not np.isfinite(upper):
+            upper = redemption_dist.ppf(1 - 1e-12)
+        values = np.arange(lower, upper + 1, dtype=np.float64)
+        probs = np.asarray(redemption_dist.pmf(values), dtype=np.float64)
+    else:
+        raise TypeError(
+            f'redemption_dist must be a discrete distribution, '
+            f'got {type(redemption_dist).__name__}'
+        )
+
+    values.flags.writeable = False
+    probs.flags.writeable = False
+    return values, probs
+
+
 def expected_values_discrete(
-    redemption_dist: stats.rv_discrete,
+    redemption_dist: DiscretePMF | stats.rv_discrete,
     config: TwoAssetConfig,
     k_components: Dict[str, float],
 ) -> Dict[str, float]:
@@ -167,36 +296,40 @@ def expected_values_discrete(
     - E[(R - τ_SOL)²₊]
     - E[(R - τ_ETH)₊ × (R - τ_SOL)₊]
     """
-    # Get discrete values and probabilities
-    if hasattr(redemption_dist, 'xk') and hasattr(redemption_dist, 'pk'):
-        values = redemption_dist.xk
-        probs = redemption_dist.pk
-    else:
-        # Fallback sampling
-        samples = redemption_dist.rvs(size=10000)
-        unique_vals, counts = np.unique(samples, return_counts=True)
-        values = unique_vals
-        probs = counts / counts.sum()
+    values, probs = _as_pmf(redemption_dist)
+    return expected_values_pmf(values, probs, config, k_components)
 
-    # Calculate expectations
-    exp_var_full = 0.0
-    exp_var_partial = 0.0
-    exp_eth_squared = 0.0
-    exp_sol_squared = 0.0
-    exp_cross_term = 0.0
-
-    for r, p in zip(values, probs):
-        # Variance expectations
-        exp_var_full += p * variance_full_period(r, config, k_components)
-        exp_var_partial += p * variance_partial_period(r, config, k_components)
 
-        # Component expectations
-        excess_eth = max(0, r - config.tau_eth)
-        excess_sol = max(0, r - config.tau_sol)
+def expected_values_pmf(
+    values: NDArray[np.float64],
+    probs: NDArray[np.float64],
+    config: TwoAssetConfig,
+    k_components: Dict[str, float],
+) -> Dict[str, float]:
+    """
+    Expected values of expected_values_discrete from pre-extracted arrays.
 
-        exp_eth_squared += p * excess_eth**2
-        exp_sol_squared += p * excess_sol**2
-        exp_cross_term += p * excess_eth * excess_sol
+    Sweeps that reuse one distribution extract (values, probs) once and call
+    this directly.
+    """
+    # Variance expectations are linear in the component expectations
+    k_eth_eth, k_eth_sol, k_sol_sol = build_k_scalars(config, k_components)
+
+    (
+        exp_var_full,
+        exp_var_partial,
+        exp_eth_squared,
+        exp_sol_squared,
+        exp_cross_term,
+    ) = expectations_kernel(
+        np.ascontiguousarray(values, dtype=np.float64),
+        np.ascontiguousarray(probs, dtype=np.float64),
+        config.tau_eth,
+        config.tau_sol,
+        k_eth_eth,
+        k_eth_sol,
+        k_sol_sol,
+    )
 
     return {
         'exp_var_full': exp_var_full,
@@ -207,6 +340,38 @@ def expected_values_discrete(
     }
 
 
+@dataclass(frozen=True)
+class _TEConstants:
+    """
+    Loop-invariant factors of the two-asset TE formula.
+
+    Annual variance = w_full × E[Var_full] + w_partial × E[Var_partial], with
+    the k-scalars already folded into the variance expectations.
+    """
+
+    w_full: float  # λ × d_short
+    w_partial: float  # λ × (d_long - d_short)
+    w_long: float  # λ × d_long
+    k_eth_eth: float
+    k_eth_sol: float
+    k_sol_sol: float
+
+    @classmethod
+    def from_config(
+        cls, config: TwoAssetConfig, k_components: Dict[str, float]
+    ) -> _TEConstants:
+        """Constants for a configuration and its k-components"""
+        d_short = config.min_unbonding  # 2 days
+        d_long = config.max_unbonding  # 10 days
+        lam = config.lambda_redemptions
+        return cls(
+            lam * d_short,
+            lam * (d_long - d_short),
+            lam * d_long,
+            *build_k_scalars(config, k_components),
+        )
+
+
 def analytical_tracking_error_two_asset(
     config: TwoAssetConfig,
     k_components: Dict[str, float],
@@ -217,16 +382,13 @@ def analytical_tracking_error_two_asset(
 
     TE = √[λ × (d_short × E[Var_full] + (d_long - d_short) × E[Var_partial])]
     """
-    d_short = config.min_unbonding  # 2 days
-    d_long = config.max_unbonding  # 10 days
+    constants = _TEConstants.from_config(config, k_components)
 
-    variance_days = (
-        d_short * expectations['exp_var_full']
-        + (d_long - d_short) * expectations['exp_var_partial']
+    annual_variance = (
+        constants.w_full * expectations['exp_var_full']
+        + constants.w_partial * expectations['exp_var_partial']
     )
 
-    annual_variance = config.lambda_redemptions * variance_days
-
     return sqrt(annual_variance)
 
 
@@ -238,48 +400,25 @@ def decompose_tracking_error(
     """
     Decompose tracking error into components for analysis.
     """
-    # Calculate k values
-    k_eth_eth = config.eth_weight**2 * k_components['v_eth_sigma_v_eth']
-    k_sol_sol = config.sol_weight**2 * k_components['v_sol_sigma_v_sol']
-    k_eth_sol = (
-        config.eth_weight * config.sol_weight * k_components['v_eth_sigma_v_sol']
-    )
-
-    # Time periods
-    d_short = config.min_unbonding
-    d_long = config.max_unbonding
+    # Loop-invariant λ × d weights and k values
+    constants = _TEConstants.from_config(config, k_components)
+    k_eth_eth = constants.k_eth_eth
+    k_sol_sol = constants.k_sol_sol
+    k_eth_sol = constants.k_eth_sol
 
     # Component contributions to annual variance
-    eth_contribution = (
-        config.lambda_redemptions * d_long * k_eth_eth * expectations['exp_eth_squared']
-    )
-    sol_contribution = (
-        config.lambda_redemptions
-        * d_short
-        * k_sol_sol
-        * expectations['exp_sol_squared']
-    )
+    eth_contribution = constants.w_long * k_eth_eth * expectations['exp_eth_squared']
+    sol_contribution = constants.w_full * k_sol_sol * expectations['exp_sol_squared']
     cross_contribution = (
-        config.lambda_redemptions
-        * d_short
-        * 2
-        * k_eth_sol
-        * expectations['exp_cross_term']
+        constants.w_full * 2 * k_eth_sol * expectations['exp_cross_term']
     )
 
     total_variance = eth_contribution + sol_contribution + cross_contribution
     total_te = sqrt(total_variance)
 
     # Individual tracking errors (hypothetical single-asset)
-    te_eth_only = sqrt(
-        config.lambda_redemptions * d_long * k_eth_eth * expectations['exp_eth_squared']
-    )
-    te_sol_only = sqrt(
-        config.lambda_redemptions
-        * d_short
-        * k_sol_sol
-        * expectations['exp_sol_squared']
-    )
+    te_eth_only = sqrt(eth_contribution)
+    te_sol_only = sqrt(sol_contribution)
 
     return {
         'total_te': total_te,
@@ -301,35 +440,27 @@ def decompose_tracking_error(
     }
 
 
+@lru_cache(maxsize=None)
 def create_market_covariance() -> NDArray[np.float64]:
     """
     Create the market covariance matrix for NCI-US index.
 
     Assets: BTC, ETH, XRP, SOL, ADA, XLM
+
+    Built once and shared; the returned matrix is read-only.
     """
     daily_vols = np.array([0.039, 0.048, 0.053, 0.071, 0.055, 0.051])
 
-    # Correlation structure
+    # Correlation structure: 0.60 everywhere (within the excluded assets
+    # XRP, SOL, ADA, XLM and across to BTC/ETH) except BTC-ETH
     n = len(daily_vols)
-    corr_matrix = np.eye(n)
-
-    # BTC-ETH correlation
+    corr_matrix = np.full((n, n), 0.60)
     corr_matrix[0, 1] = corr_matrix[1, 0] = 0.70
+    np.fill_diagonal(corr_matrix, 1.0)
 
-    # Within excluded assets (XRP, SOL, ADA, XLM)
-    for i in range(2, n):
-        for j in range(i + 1, n):
-            corr_matrix[i, j] = corr_matrix[j, i] = 0.60
-
-    # Cross correlations
-    for i in [0, 1]:  # BTC, ETH
-        for j in range(2, n):  # Others
-            if (i, j) != (0, 1) and (i, j) != (1, 0):
-                corr_matrix[i, j] = corr_matrix[j, i] = 0.60
-
-    # Convert to covariance
-    vol_diag = np.diag(daily_vols)
-    cov_matrix = vol_diag @ corr_matrix @ vol_diag
+    # Convert to covariance by scaling with the outer product of the vols
+    cov_matrix = np.outer(daily_vols, daily_vols) * corr_matrix
+    cov_matrix.flags.writeable = False
 
     return cov_matrix
 
@@ -354,7 +485,7 @@ def main():
     # Create redemption distribution
     values = [0.05, 0.10, 0.20, 0.30]
     weights = [12 / 18, 3 / 18, 2 / 18, 1 / 18]
-    redemption_dist = stats.rv_discrete(values=(values, weights))
+    redemption_dist = DiscretePMF(values, weights)
 
     print('\nRedemption Distribution:')
     for v, w in zip(values, weights):
@@ -410,13 +541,24 @@ def main():
     print(f'{"Redemption":>10} {"Full Var":>12} {"Partial Var":>12} {"Var-Days":>12}')
     print('-' * 50)
 
+    # Loop invariants: k-scalars, thresholds and period lengths
+    k_eth_eth, k_eth_sol, k_sol_sol = build_k_scalars(config, k_components)
+    tau_eth, tau_sol = config.tau_eth, config.tau_sol
+    d_short = config.min_unbonding
+    d_partial = config.max_unbonding - config.min_unbonding
+
     for r in values:
-        var_full = variance_full_period(r, config, k_components)
-        var_partial = variance_partial_period(r, config, k_components)
-        var_days = (
-            config.min_unbonding * var_full
-            + (config.max_unbonding - config.min_unbonding) * var_partial
+        excess_eth = r - tau_eth
+        excess_eth = excess_eth if excess_eth > 0.0 else 0.0
+        excess_sol = r - tau_sol
+        excess_sol = excess_sol if excess_sol > 0.0 else 0.0
+        var_partial = k_eth_eth * excess_eth * excess_eth
+        var_full = (
+            var_partial
+            + 2 * k_eth_sol * excess_eth * excess_sol
+            + k_sol_sol * excess_sol * excess_sol
         )
+        var_days = d_short * var_full + d_partial * var_partial
         print(f'{r:>10.0%} {var_full:>12.8f} {var_partial:>12.8f} {var_days:>12.8f}')
 
 
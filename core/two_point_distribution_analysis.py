@@ -12,10 +12,22 @@ The Two-Point Distribution models bimodal redemption patterns:
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Tuple, List
+from functools import lru_cache
+from typing import Tuple, List, Optional, Sequence, Union
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 from math import sqrt
-from core.optimal_eth_over_te_dynamic import MarketConfig, CovarianceBuilder
+from core.optimal_eth_over_te_dynamic import MarketConfig, get_covariance_builder
+from core.two_asset_analytical_formula import _spd_solve
+
+
+def _expected_squared_excess(r1: float, r2: float, p: float, threshold: float) -> float:
+    """E[(R - τ)²₊] for a two-point distribution given by its raw parameters"""
+    excess1 = r1 - threshold
+    excess1 = excess1 if excess1 > 0.0 else 0.0
+    excess2 = r2 - threshold
+    excess2 = excess2 if excess2 > 0.0 else 0.0
+    return p * excess1**2 + (1 - p) * excess2**2
 
 
 @dataclass(frozen=True)
@@ -52,9 +64,7 @@ class TwoPointDistribution:
 
     def expected_squared_excess(self, threshold: float) -> float:
         """E[(R - τ)²₊] for given threshold"""
-        excess1 = max(0, self.r1 - threshold)
-        excess2 = max(0, self.r2 - threshold)
-        return self.p * excess1**2 + (1 - self.p) * excess2**2
+        return _expected_squared_excess(self.r1, self.r2, self.p, threshold)
 
     def describe(self) -> str:
         """Human-readable description"""
@@ -64,14 +74,61 @@ class TwoPointDistribution:
         )
 
 
+@dataclass(frozen=True)
+class TwoPointDistributionBatch:
+    """
+    Structure-of-arrays batch of Two-Point Distributions.
+
+    Row i is P(R = r1[i]) = p[i], P(R = r2[i]) = 1-p[i]; expectations are
+    evaluated for all rows and thresholds at once by broadcasting.
+    """
+
+    r1: NDArray[np.float64]  # First redemption sizes
+    r2: NDArray[np.float64]  # Second redemption sizes
+    p: NDArray[np.float64]  # Probabilities of r1
+
+    def __post_init__(self):
+        for name in ('r1', 'r2', 'p'):
+            values = np.asarray(getattr(self, name), dtype=np.float64)
+            outside = ~((0 <= values) & (values <= 1))
+            if outside.any():
+                raise ValueError(f'{name} must be in [0,1], got {values[outside][0]}')
+            object.__setattr__(self, name, values)
+
+    @classmethod
+    def from_distributions(
+        cls, distributions: Sequence[TwoPointDistribution]
+    ) -> TwoPointDistributionBatch:
+        """Batch of already-validated distributions"""
+        return cls(
+            np.array([d.r1 for d in distributions]),
+            np.array([d.r2 for d in distributions]),
+            np.array([d.p for d in distributions]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.r1)
+
+    def expected_squared_excess_batch(
+        self, thresholds: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """E[(R - τ)²₊] as a (distributions × thresholds) array"""
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        excess1 = np.maximum(0.0, self.r1[:, None] - thresholds[None, :])
+        excess2 = np.maximum(0.0, self.r2[:, None] - thresholds[None, :])
+        return self.p[:, None] * excess1**2 + (1 - self.p)[:, None] * excess2**2
+
+
+@lru_cache(maxsize=None)
 def calculate_base_k(market: MarketConfig) -> float:
     """
     Calculate base_k = eth_weight² × (v' Σ v) from market configuration.
+
+    Cached per market, so sweeps over the same market factorize Σ once.
     """
     # Build covariance matrix
-    cov_builder = CovarianceBuilder(market)
+    cov_builder = get_covariance_builder(market)
     cov_matrix = cov_builder.matrix
-    inv_cov = np.linalg.inv(cov_matrix)
 
     # Constraint matrix for Lagrange optimization
     n = len(market.assets)
@@ -83,13 +140,14 @@ def calculate_base_k(market: MarketConfig) -> float:
     # Unit constraint vector e2 = [0, 1]'
     e2 = np.array([0.0, 1.0])
 
-    # Compute v = Σ⁻¹ C' (C Σ⁻¹ C')⁻¹ e₂
-    C_inv_cov_C = C @ inv_cov @ C.T
-    lambda_0 = np.linalg.solve(C_inv_cov_C, e2)
-    v = inv_cov @ C.T @ lambda_0
+    # Compute v = Σ⁻¹ C' (C Σ⁻¹ C')⁻¹ e₂; Σ and C Σ⁻¹ C' are symmetric
+    # positive definite, so both come from Cholesky solves
+    inv_cov_ct = _spd_solve(cov_matrix, C.T)
+    lambda_0 = _spd_solve(C @ inv_cov_ct, e2)
+    v = inv_cov_ct @ lambda_0
 
-    # Compute (v' Σ v)
-    v_sigma_v = v @ cov_matrix @ v
+    # Compute (v' Σ v) as a single einsum contraction
+    v_sigma_v = np.einsum('i,ij,j->', v, cov_matrix, v, optimize=True)
 
     # Calculate base_k
     eth_weight = market.eth_weight
@@ -117,6 +175,34 @@ def analytical_te(
     return sqrt(variance_days)
 
 
+def analytical_te_variance(
+    lambda_redemptions: float,
+    episode_days: float,
+    base_k: float,
+    staking_pct: ArrayLike,
+    distribution: Union[TwoPointDistribution, TwoPointDistributionBatch],
+    *,
+    out: Optional[NDArray[np.float64]] = None,
+) -> NDArray[np.float64]:
+    """
+    Annual TE variance λ × d × base_k × E[(R - τ)²₊] over many staking levels.
+
+    For a single distribution the result has one entry per staking level; for
+    a batch it is (distributions × staking levels). Sweeps take one np.sqrt
+    of the result instead of a scalar sqrt per point.
+    """
+    thresholds = 1 - np.atleast_1d(np.asarray(staking_pct, dtype=np.float64))
+    if isinstance(distribution, TwoPointDistribution):
+        batch = TwoPointDistributionBatch.from_distributions([distribution])
+        expected_squared_excess = batch.expected_squared_excess_batch(thresholds)[0]
+    else:
+        expected_squared_excess = distribution.expected_squared_excess_batch(thresholds)
+
+    return np.multiply(
+        lambda_redemptions * episode_days * base_k, expected_squared_excess, out=out
+    )
+
+
 def sensitivity_analysis_staking(
     base_k: float,
     lambda_redemptions: float,
@@ -129,15 +215,15 @@ def sensitivity_analysis_staking(
     Analyze TE sensitivity to staking percentage.
     """
     staking_pcts = np.linspace(staking_range[0], staking_range[1], n_points)
-    te_values = []
 
-    for staking_pct in staking_pcts:
-        te = analytical_te(
-            lambda_redemptions, episode_days, base_k, staking_pct, distribution
+    # E[(R - τ)²₊] is elementwise in τ, so the whole sweep is one broadcast
+    te_values = np.sqrt(
+        analytical_te_variance(
+            lambda_redemptions, episode_days, base_k, staking_pcts, distribution
         )
-        te_values.append(te)
+    )
 
-    return staking_pcts.tolist(), te_values
+    return staking_pcts.tolist(), te_values.tolist()
 
 
 def sensitivity_analysis_distribution(
@@ -156,16 +242,16 @@ def sensitivity_analysis_distribution(
     r1_values = np.linspace(r1_range[0], r1_range[1], n_points)
     r2_values = np.linspace(r2_range[0], r2_range[1], n_points)
 
-    # Create grid
-    te_grid = np.zeros((n_points, n_points))
-
-    for i, r1 in enumerate(r1_values):
-        for j, r2 in enumerate(r2_values):
-            dist = TwoPointDistribution(r1, r2, p)
-            te = analytical_te(
-                lambda_redemptions, episode_days, base_k, staking_pct, dist
-            )
-            te_grid[i, j] = te
+    # One batch row per (r1, r2) cell; the batch validates every cell
+    r1_grid, r2_grid = np.meshgrid(r1_values, r2_values, indexing='ij')
+    batch = TwoPointDistributionBatch(
+        r1_grid.ravel(), r2_grid.ravel(), np.full(r1_grid.size, p)
+    )
+    te_grid = np.sqrt(
+        analytical_te_variance(
+            lambda_redemptions, episode_days, base_k, staking_pct, batch
+        )
+    ).reshape(n_points, n_points)
 
     return {
         'r1_values': r1_values.tolist(),
@@ -213,10 +299,17 @@ def main():
     print()
     print('-' * 70)
 
-    for staking in staking_levels:
+    # All distributions × staking levels in one batched evaluation
+    batch = TwoPointDistributionBatch.from_distributions(distributions)
+    te_table = np.sqrt(
+        analytical_te_variance(
+            lambda_redemptions, episode_days, base_k, staking_levels, batch
+        )
+    )
+
+    for staking, te_row in zip(staking_levels, te_table.T):
         print(f'{staking:6.0%}', end='')
-        for dist in distributions:
-            te = analytical_te(lambda_redemptions, episode_days, base_k, staking, dist)
+        for te in te_row:
             print(f'    {te:7.4%}', end='')
         print()
 
@@ -260,13 +353,15 @@ def main():
     print('\nr1      Mean    E[(R-τ)²₊]    TE')
     print('-' * 40)
 
+    # Fixed, valid parameters: evaluate the closed form without building a
+    # validated TwoPointDistribution per row
+    threshold = 1 - staking
     for r1 in [0.01, 0.05, 0.10, 0.15, 0.20]:
-        dist = TwoPointDistribution(r1, r2, p)
-        threshold = 1 - staking
-        e_squared = dist.expected_squared_excess(threshold)
-        te = analytical_te(lambda_redemptions, episode_days, base_k, staking, dist)
+        mean = p * r1 + (1 - p) * r2
+        e_squared = _expected_squared_excess(r1, r2, p, threshold)
+        te = sqrt(lambda_redemptions * episode_days * base_k * e_squared)
 
-        print(f'{r1:4.0%}    {dist.mean:4.0%}    {e_squared:9.6f}    {te:6.4%}')
+        print(f'{r1:4.0%}    {mean:4.0%}    {e_squared:9.6f}    {te:6.4%}')
 
     # 4. Optimal staking given distribution
     print('\n' + '-' * 70)
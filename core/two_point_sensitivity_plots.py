@@ -2,18 +2,24 @@
 Generate sensitivity analysis plots for Two-Point Distribution
 """
 
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import matplotlib
+
+# Plots are only written to files: use the non-interactive Agg backend rather
+# than letting pyplot probe for a GUI backend
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from core.two_point_distribution_analysis import (
     TwoPointDistribution,
+    TwoPointDistributionBatch,
+    analytical_te_variance,
     calculate_base_k,
-    sensitivity_analysis_staking,
-    sensitivity_analysis_distribution,
 )
 from core.optimal_eth_over_te_dynamic import MarketConfig
 
 
-def plot_staking_sensitivity():
+def plot_staking_sensitivity() -> str:
     """Plot TE vs staking percentage for different distributions"""
     # Setup
     market = MarketConfig()
@@ -31,12 +37,18 @@ def plot_staking_sensitivity():
 
     plt.figure(figsize=(10, 6))
 
-    for label, dist in scenarios:
-        staking_pcts, te_values = sensitivity_analysis_staking(
-            base_k, lambda_redemptions, episode_days, dist, (0, 1), 50
-        )
-        te_pcts = [te * 100 for te in te_values]  # Convert to percentage
-        plt.plot(staking_pcts, te_pcts, label=label, linewidth=2)
+    # Sweep all scenarios at once: (scenarios × staking levels)
+    staking_pcts = np.linspace(0, 1, 50)
+    batch = TwoPointDistributionBatch.from_distributions([
+        dist for _, dist in scenarios
+    ])
+    annual_variance = analytical_te_variance(
+        lambda_redemptions, episode_days, base_k, staking_pcts, batch
+    )
+    te_pcts = np.sqrt(annual_variance) * 100  # Convert to percentage
+
+    for (label, _), te_row in zip(scenarios, te_pcts):
+        plt.plot(staking_pcts, te_row, label=label, linewidth=2)
 
     # Add threshold markers
     for s in [0.7, 0.8, 0.9]:
@@ -60,10 +72,10 @@ def plot_staking_sensitivity():
     )
     plt.close()
 
-    print('Created: staking_sensitivity_two_point.png')
+    return 'staking_sensitivity_two_point.png'
 
 
-def plot_distribution_heatmap():
+def plot_distribution_heatmap() -> str:
     """Plot TE heatmap for different r1, r2 combinations"""
     # Setup
     market = MarketConfig()
@@ -76,20 +88,29 @@ def plot_distribution_heatmap():
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     p_values = [0.9, 0.8, 0.5]  # High frequency of r1, moderate, equal
 
+    # The squared excesses over the (r1, r2) grid are shared by every p; only
+    # their probability mix changes between panels
+    n_points = 10
+    r1_values = np.linspace(0, 0.3, n_points)
+    r2_values = np.linspace(0, 0.5, n_points)
+    threshold = 1 - staking_pct
+    squared_excess1 = np.maximum(0.0, r1_values[:, None] - threshold) ** 2
+    squared_excess2 = np.maximum(0.0, r2_values[None, :] - threshold) ** 2
+    scale = lambda_redemptions * episode_days * base_k
+
+    # Tick positions and labels are shared by every panel too
+    n_ticks = 6
+    r1_ticks = np.linspace(0, n_points - 1, n_ticks).astype(int)
+    r2_ticks = np.linspace(0, n_points - 1, n_ticks).astype(int)
+    r1_labels = [f'{r:.0%}' for r in r1_values[r1_ticks]]
+    r2_labels = [f'{r:.0%}' for r in r2_values[r2_ticks]]
+
     for idx, (ax, p) in enumerate(zip(axes, p_values)):
-        result = sensitivity_analysis_distribution(
-            base_k,
-            lambda_redemptions,
-            episode_days,
-            staking_pct,
-            r1_range=(0, 0.3),
-            r2_range=(0, 0.5),
-            p=p,
+        # TE grid, converted to percentage
+        te_grid_pct = (
+            np.sqrt(scale * (p * squared_excess1 + (1 - p) * squared_excess2)) * 100
         )
 
-        # Convert to percentage
-        te_grid_pct = result['te_grid'] * 100
-
         # Create heatmap
         im = ax.imshow(
             te_grid_pct,
@@ -105,14 +126,10 @@ def plot_distribution_heatmap():
         ax.set_title(f'p = {p:.1f}\n(P(r1) = {p:.0%})', fontsize=12)
 
         # Set tick labels
-        n_ticks = 6
-        r1_ticks = np.linspace(0, len(result['r1_values']) - 1, n_ticks).astype(int)
-        r2_ticks = np.linspace(0, len(result['r2_values']) - 1, n_ticks).astype(int)
-
         ax.set_xticks(r2_ticks)
-        ax.set_xticklabels([f'{result["r2_values"][i]:.0%}' for i in r2_ticks])
+        ax.set_xticklabels(r2_labels)
         ax.set_yticks(r1_ticks)
-        ax.set_yticklabels([f'{result["r1_values"][i]:.0%}' for i in r1_ticks])
+        ax.set_yticklabels(r1_labels)
 
         # Add contour lines
         contour = ax.contour(
@@ -121,6 +138,7 @@ def plot_distribution_heatmap():
             colors='black',
             alpha=0.4,
             linewidths=1,
+            algorithm='serial',  # ContourPy's faster serial algorithm
         )
         ax.clabel(contour, inline=True, fontsize=8, fmt='%.1f%%')
 
@@ -140,10 +158,10 @@ def plot_distribution_heatmap():
     )
     plt.close()
 
-    print('Created: distribution_heatmap_two_point.png')
+    return 'distribution_heatmap_two_point.png'
 
 
-def plot_threshold_effects():
+def plot_threshold_effects() -> str:
     """Visualize how threshold affects contribution to TE"""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
 
@@ -153,11 +171,8 @@ def plot_threshold_effects():
 
     # Range of thresholds
     thresholds = np.linspace(0, 0.5, 100)
-    contributions = []
-
-    for tau in thresholds:
-        e_squared = dist.expected_squared_excess(tau)
-        contributions.append(e_squared)
+    batch = TwoPointDistributionBatch.from_distributions([dist])
+    contributions = batch.expected_squared_excess_batch(thresholds)[0]
 
     # Convert threshold to staking percentage
     1 - thresholds
@@ -175,24 +190,16 @@ def plot_threshold_effects():
     ax1.grid(True, alpha=0.3)
 
     # Plot 2: Component contributions
-    staking_levels = [0.5, 0.7, 0.8, 0.9, 0.95]
-    contributions_r1 = []
-    contributions_r2 = []
-
-    for s in staking_levels:
-        tau = 1 - s
-        c1 = p * max(0, r1 - tau) ** 2
-        c2 = (1 - p) * max(0, r2 - tau) ** 2
-        contributions_r1.append(c1)
-        contributions_r2.append(c2)
+    staking_levels = np.array([0.5, 0.7, 0.8, 0.9, 0.95])
+    tau = 1 - staking_levels
+    contributions_r1 = p * np.maximum(0.0, r1 - tau) ** 2
+    contributions_r2 = (1 - p) * np.maximum(0.0, r2 - tau) ** 2
 
     x = np.arange(len(staking_levels))
     width = 0.35
 
-    bars1 = ax2.bar(
-        x - width / 2, contributions_r1, width, label=f'r1={r1:.0%} (p={p:.1f})'
-    )
-    bars2 = ax2.bar(
+    ax2.bar(x - width / 2, contributions_r1, width, label=f'r1={r1:.0%} (p={p:.1f})')
+    ax2.bar(
         x + width / 2, contributions_r2, width, label=f'r2={r2:.0%} (p={1 - p:.1f})'
     )
 
@@ -204,19 +211,16 @@ def plot_threshold_effects():
     ax2.legend()
     ax2.grid(True, alpha=0.3, axis='y')
 
-    # Add value labels on bars
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0.0001:
-                ax2.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height,
-                    f'{height:.4f}',
-                    ha='center',
-                    va='bottom',
-                    fontsize=8,
-                )
+    # Add value labels on bars, at each bar's center from the bar positions
+    for centers, heights in [
+        (x - width / 2, contributions_r1),
+        (x + width / 2, contributions_r2),
+    ]:
+        labelled = heights > 0.0001
+        for center, height in zip(centers[labelled], heights[labelled]):
+            ax2.text(
+                center, height, f'{height:.4f}', ha='center', va='bottom', fontsize=8
+            )
 
     plt.suptitle(
         f'Threshold Effects for Two-Point Distribution\n'
@@ -228,16 +232,25 @@ def plot_threshold_effects():
     plt.savefig('images/threshold_effects_two_point.png', dpi=150, bbox_inches='tight')
     plt.close()
 
-    print('Created: threshold_effects_two_point.png')
+    return 'threshold_effects_two_point.png'
 
 
 def main():
     """Generate all sensitivity analysis plots"""
     print('Generating Two-Point Distribution sensitivity analysis plots...')
 
-    plot_staking_sensitivity()
-    plot_distribution_heatmap()
-    plot_threshold_effects()
+    # The plots share no state and each writes its own file: render them in
+    # separate processes (pyplot state is per process) and report them in
+    # submission order, re-raising any failure
+    plots = [
+        plot_staking_sensitivity,
+        plot_distribution_heatmap,
+        plot_threshold_effects,
+    ]
+    with ProcessPoolExecutor(max_workers=len(plots)) as executor:
+        futures = [executor.submit(plot) for plot in plots]
+        for future in futures:
+            print(f'Created: {future.result()}')
 
     print('\nAll plots generated successfully!')
     print('\nKey insights from the analysis:')
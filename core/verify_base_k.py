@@ -8,47 +8,56 @@ This script verifies that base_k = eth_weight² × (v' Σ v) by:
 3. Confirming the quadratic relationship
 """
 
+from functools import lru_cache
 import numpy as np
+from scipy.linalg import cho_factor, cho_solve
 from core.optimal_eth_over_te_dynamic import (
     MarketConfig,
-    CovarianceBuilder,
-    ActiveWeightOptimizer,
+    get_covariance_builder,
+    get_optimizer,
 )
 
 
+@lru_cache(maxsize=None)
 def compute_base_k_components(market: MarketConfig) -> dict:
     """
     Compute and decompose base_k to verify the mathematical derivation.
+
+    Cached per market; the returned dict is shared, so treat it as read-only.
     """
     # Build covariance matrix
-    cov_builder = CovarianceBuilder(market)
+    cov_builder = get_covariance_builder(market)
     cov_matrix = cov_builder.matrix
-    inv_cov = np.linalg.inv(cov_matrix)
 
     # Constraint matrix C
     n = len(market.assets)
-    C = np.vstack([
-        np.ones(n),  # sum-to-zero
-        np.eye(n)[1],  # ETH-specific (index 1)
-    ])
+    C = np.zeros((2, n))
+    C[0, :] = 1.0  # sum-to-zero
+    C[1, 1] = 1.0  # ETH-specific (index 1)
 
     # Unit constraint vector e2 = [0, 1]'
     e2 = np.array([0.0, 1.0])
 
+    # Σ⁻¹ C' from one Cholesky factorization (Σ is symmetric positive definite)
+    inv_cov_ct = cho_solve(cho_factor(cov_matrix), C.T)
+
     # Compute λ₀ = (C Σ⁻¹ C')⁻¹ e₂
-    C_inv_cov_C = C @ inv_cov @ C.T
+    C_inv_cov_C = C @ inv_cov_ct
     lambda_0 = np.linalg.solve(C_inv_cov_C, e2)
 
     # Compute v = Σ⁻¹ C' λ₀
-    v = inv_cov @ C.T @ lambda_0
+    v = inv_cov_ct @ lambda_0
 
-    # Compute (v' Σ v)
-    v_sigma_v = v @ cov_matrix @ v
+    # Compute (v' Σ v) as a single einsum contraction
+    v_sigma_v = float(np.einsum('i,ij,j->', v, cov_matrix, v, optimize=True))
 
     # Compute base_k
     eth_weight = market.eth_weight
     base_k = eth_weight**2 * v_sigma_v
 
+    v.flags.writeable = False
+    lambda_0.flags.writeable = False
+
     return {
         'v': v,
         'v_sigma_v': v_sigma_v,
@@ -65,14 +74,13 @@ def verify_linearity_and_quadratic(market: MarketConfig, staking_pct: float = 0.
     2. Variance is quadratic in delta_eth
     3. base_k correctly predicts variance
     """
-    # Initialize optimizer
-    cov_builder = CovarianceBuilder(market)
-    optimizer = ActiveWeightOptimizer(cov_builder.matrix)
+    # Initialize optimizer (shared per market with the other analyses)
+    cov_builder = get_covariance_builder(market)
+    optimizer = get_optimizer(market)
 
     # Get base_k components
     components = compute_base_k_components(market)
     base_k = components['base_k']
-    v = components['v']
 
     print('BASE_K VERIFICATION')
     print('=' * 60)
@@ -86,25 +94,25 @@ def verify_linearity_and_quadratic(market: MarketConfig, staking_pct: float = 0.
     print('delta_eth   ||active||   Variance    Predicted   Error')
     print('-' * 60)
 
-    delta_eth_values = [0.01, 0.02, 0.03, 0.04, 0.05]
-
-    for delta_eth in delta_eth_values:
-        # Get optimal active weights
-        active = optimizer.optimize(delta_eth)
+    delta_eth_values = np.array([0.01, 0.02, 0.03, 0.04, 0.05])
 
-        # Calculate actual variance
-        variance = active @ cov_builder.matrix @ active
+    # Optimal active weights for every delta_eth at once: (n_assets, N)
+    active = optimizer.optimize_batch(delta_eth_values)
 
-        # Predicted variance using base_k
-        # Note: variance = delta_eth² × (v' Σ v)
-        predicted_var = (delta_eth**2) * components['v_sigma_v']
+    # Calculate actual variance of each column: diag(A' Σ A)
+    cov_matrix = cov_builder.matrix
+    variances = np.einsum('ia,ij,ja->a', active, cov_matrix, active, optimize=True)
+    norms = np.linalg.norm(active, axis=0)
 
-        # Verify linearity: active weights should be delta_eth × v
-        expected_active = delta_eth * v
-        np.linalg.norm(active - expected_active)
+    # Predicted variance using base_k
+    # Note: variance = delta_eth² × (v' Σ v)
+    predicted = delta_eth_values**2 * components['v_sigma_v']
 
+    for delta_eth, norm, variance, predicted_var in zip(
+        delta_eth_values, norms, variances, predicted
+    ):
         print(
-            f'{delta_eth:8.4f}   {np.linalg.norm(active):8.4f}   '
+            f'{delta_eth:8.4f}   {norm:8.4f}   '
             f'{variance:8.6f}   {predicted_var:8.6f}   {abs(variance - predicted_var):8.2e}'
         )
 
@@ -115,20 +123,21 @@ def verify_linearity_and_quadratic(market: MarketConfig, staking_pct: float = 0.
     print('-' * 60)
 
     threshold = 1 - staking_pct
-    redemptions = [0.25, 0.30, 0.40, 0.50, 0.75, 1.00]
+    redemptions = np.array([0.25, 0.30, 0.40, 0.50, 0.75, 1.00])
 
-    for r in redemptions:
-        if r > threshold:
-            delta_eth = market.eth_weight * (r - threshold)
-            active = optimizer.optimize(delta_eth)
-            variance = active @ cov_builder.matrix @ active
+    # Only redemptions above the threshold create an ETH overweight
+    excess = redemptions[redemptions > threshold] - threshold
+    delta_eth_values = market.eth_weight * excess
+    active = optimizer.optimize_batch(delta_eth_values)
+    variances = np.einsum('ia,ij,ja->a', active, cov_matrix, active, optimize=True)
 
-            # Using base_k formula
-            var_base_k = base_k * ((r - threshold) ** 2)
+    # Using base_k formula
+    var_base_k = base_k * excess**2
 
-            print(
-                f'{r:8.1%}     {delta_eth:8.4f}   {variance:8.6f}   {var_base_k:8.6f}'
-            )
+    for r, delta_eth, variance, var_k in zip(
+        redemptions[redemptions > threshold], delta_eth_values, variances, var_base_k
+    ):
+        print(f'{r:8.1%}     {delta_eth:8.4f}   {variance:8.6f}   {var_k:8.6f}')
 
 
 def demonstrate_v_vector(market: MarketConfig):
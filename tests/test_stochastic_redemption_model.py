@@ -0,0 +1,41 @@
+"""
+Tests for the stochastic redemption model's excess moments
+"""
+
+import pytest
+from scipy import integrate, stats
+from core.optimal_eth_over_te_dynamic import MarketConfig
+from core.stochastic_redemption_model import (
+    EnhancedStochasticModel,
+    VarianceParameters,
+)
+
+
+@pytest.mark.parametrize(
+    'redemption_dist',
+    [
+        stats.expon(loc=0.3, scale=0.1),
+        stats.truncnorm(0, 5, loc=0.3, scale=0.05),
+        stats.gamma(2, loc=0.3, scale=0.05),
+        stats.expon(scale=0.1),
+    ],
+)
+def test_expected_variance_matches_quad(redemption_dist):
+    """Quadrature follows the support when it starts above the threshold"""
+    params = VarianceParameters.from_market_config(MarketConfig(), 0.8)
+    model = EnhancedStochasticModel(18, redemption_dist, params)
+
+    threshold = params.threshold
+    lower, upper = redemption_dist.support()
+    reference, _ = integrate.quad(
+        lambda r: (r - threshold) ** 2 * redemption_dist.pdf(r),
+        max(threshold, lower),
+        min(1.0, upper),
+        epsabs=0,
+        epsrel=1e-12,
+        limit=200,
+    )
+
+    assert model.expected_variance() == pytest.approx(
+        params.base_k * reference, rel=1e-10
+    )